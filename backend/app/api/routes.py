@@ -1,9 +1,28 @@
 import asyncio
+from typing import Literal
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
 
-from app.models import SimConfig, SimResults
+from app.api.sessions import sessions
+from app.models import (
+    SCALAR_METRICS,
+    EmergencyStatus,
+    LogPage,
+    Prediction,
+    RareEventRequest,
+    RareEventResults,
+    ReplicationRequest,
+    ReplicationResults,
+    SimConfig,
+    SimResults,
+    SimSummary,
+    StreamSubscription,
+)
 from app.simulation.engine import AirportSimulation
+from app.simulation.rare_events import estimate_rare_events
+from app.simulation.replication import run_replications
+from app.simulation.store import SortField, StoredRun, store
+from app.simulation.surrogate import SURROGATE_PATH, Surrogate
 
 router = APIRouter()
 
@@ -12,24 +31,95 @@ router = APIRouter()
 STREAM_TICK_DELAY = 0.05
 STREAM_STEP_SIZE = 1.0  # sim-minutes per tick
 
+# Trained offline (see app.simulation.surrogate); None if not trained yet
+surrogate = Surrogate.load(SURROGATE_PATH)
+
 
 @router.get("/health")
 def health() -> dict:
     return {"status": "ok"}
 
 
-@router.post("/simulate", response_model=SimResults)
-def simulate(config: SimConfig) -> SimResults:
+@router.post("/simulate", response_model=SimResults | SimSummary)
+def simulate(config: SimConfig, include_logs: bool = False) -> SimResults | SimSummary:
+    """Run a simulation and store it. Per-aircraft logs are left out unless
+    include_logs is set; fetch them page by page from /runs/{run_id}/logs."""
     sim = AirportSimulation(config)
-    return sim.run()
+    results = sim.run()
+    run = store.add(results)
+    if include_logs:
+        return results.model_copy(update={"run_id": run.run_id})
+    return run.summary
+
+
+@router.post("/simulate/replicate", response_model=ReplicationResults)
+def replicate(request: ReplicationRequest) -> ReplicationResults:
+    """Replicate with independent seeds until each target metric's
+    confidence half-width is reached (or max_replications runs out)."""
+    return run_replications(request)
+
+
+@router.post("/simulate/rare-events", response_model=RareEventResults)
+def rare_events(request: RareEventRequest) -> RareEventResults:
+    """Importance-sampled diversion/emergency probabilities with variances."""
+    return estimate_rare_events(request)
+
+
+@router.post("/predict", response_model=Prediction)
+def predict(config: SimConfig) -> Prediction:
+    """Approximate results from the surrogate, falling back to a real
+    simulation when config is outside its trained region."""
+    if surrogate is not None:
+        prediction = surrogate.predict(config)
+        if prediction is not None:
+            return prediction
+    results = AirportSimulation(config).run()
+    return Prediction(
+        source="simulation",
+        metrics={m: float(getattr(results, m)) for m in SCALAR_METRICS},
+    )
+
+
+@router.get("/runs/{run_id}", response_model=SimSummary)
+def get_run(run_id: str) -> SimSummary:
+    return _get_stored_run(run_id).summary
+
+
+@router.get("/runs/{run_id}/logs", response_model=LogPage)
+def get_run_logs(
+    run_id: str,
+    outcome: list[Literal["landed", "departed", "diverted", "cancelled"]] | None = Query(None),
+    emergency: list[EmergencyStatus] | None = Query(None),
+    from_time: float | None = None,
+    to_time: float | None = None,
+    min_delay: float | None = None,
+    sort: SortField = "scheduled_time",
+    order: Literal["asc", "desc"] = "asc",
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+) -> LogPage:
+    run = _get_stored_run(run_id)
+    try:
+        return run.query(
+            outcomes=outcome,
+            emergencies=emergency,
+            from_time=from_time,
+            to_time=to_time,
+            min_delay=min_delay,
+            sort=sort,
+            descending=order == "desc",
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.websocket("/simulate/stream")
 async def simulate_stream(websocket: WebSocket) -> None:
     await websocket.accept()
     try:
-        data = await websocket.receive_json()
-        config = SimConfig(**data)
+        config, subscription = _parse_stream_request(await websocket.receive_json())
 
         sim = AirportSimulation(config)
         sim.setup()
@@ -40,14 +130,90 @@ async def simulate_stream(websocket: WebSocket) -> None:
             sim.step(next_time)
             current = next_time
 
-            snapshot = sim.snapshot()
+            snapshot = sim.snapshot(subscription)
             await websocket.send_json(snapshot)
             await asyncio.sleep(STREAM_TICK_DELAY)
 
         # Send final message
         final = sim.stats.compile()
-        await websocket.send_json({"type": "done", **final.model_dump()})
+        final.run_id = store.add(final).run_id
+        if subscription is None:
+            await websocket.send_json({"type": "done", **final.model_dump()})
+        else:
+            await websocket.send_json({
+                "type": "done",
+                "run_id": final.run_id,
+                **sim.stats.compile_subscribed(subscription),
+            })
+    except WebSocketDisconnect:
+        pass
+    except Exception:
+        await websocket.close(code=1011)
+
+
+@router.get("/simulate/live")
+def live_sessions() -> list[dict]:
+    return sessions.active()
+
+
+@router.websocket("/simulate/live/{name}")
+async def simulate_live(websocket: WebSocket, name: str) -> None:
+    """Join (or start) a named simulation shared by all its viewers.
+
+    The first client's SimConfig starts the run; later joiners still send a
+    config message but it is ignored, and they receive a "catchup" message
+    with the current state before the regular ticks. Each viewer may send
+    its own subscription.
+    """
+    await websocket.accept()
+    session = None
+    try:
+        config, subscription = _parse_stream_request(await websocket.receive_json())
+
+        session = sessions.get_or_create(
+            name, config, STREAM_TICK_DELAY, STREAM_STEP_SIZE
+        )
+        await session.subscribe(websocket, subscription)
+
+        # Wait for the run to finish, or for this client to go away
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(websocket))
+        finished = asyncio.ensure_future(session.finished.wait())
+        await asyncio.wait(
+            {disconnected, finished}, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in (disconnected, finished):
+            task.cancel()
+        if session.error is not None:
+            await websocket.close(code=1011)
     except WebSocketDisconnect:
         pass
     except Exception:
         await websocket.close(code=1011)
+    finally:
+        if session is not None:
+            sessions.release(session, websocket)
+
+
+def _parse_stream_request(data: dict) -> tuple[SimConfig, StreamSubscription | None]:
+    """Split a stream request into its SimConfig and optional
+    "subscription" (sent alongside the config fields)."""
+    subscription = data.pop("subscription", None)
+    if subscription is not None:
+        subscription = StreamSubscription(**subscription)
+    return SimConfig(**data), subscription
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Discard anything a viewer sends until its socket closes."""
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+def _get_stored_run(run_id: str) -> StoredRun:
+    run = store.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run: {run_id}")
+    return run
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+
+from fastapi import WebSocket
+
+from app.models import SimConfig, StreamSubscription
+from app.simulation.engine import AirportSimulation
+from app.simulation.store import store
+
+logger = logging.getLogger(__name__)
+
+
+class LiveSession:
+    """A single simulation run whose ticks are broadcast to many websockets.
+
+    The simulation is stepped once per tick regardless of how many clients
+    are watching. Viewers are grouped by subscription, and each tick is
+    compiled and serialized once per group rather than once per viewer.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: SimConfig,
+        tick_delay: float,
+        step_size: float,
+    ) -> None:
+        self.name = name
+        self.config = config
+        self.tick_delay = tick_delay
+        self.step_size = step_size
+        self.sim = AirportSimulation(config)
+        self.subscribers: dict[WebSocket, StreamSubscription | None] = {}
+        # Frames held back for viewers whose catch-up is still being sent
+        self._catching_up: dict[WebSocket, list[str]] = {}
+        self.finished = asyncio.Event()
+        # Set if the run itself failed; viewers are then closed with 1011
+        self.error: Exception | None = None
+
+        self._ticked = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def sim_time(self) -> float:
+        return self.sim.env.now
+
+    def start(self) -> None:
+        self.sim.setup()
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        self.finished.set()
+
+    async def subscribe(
+        self, websocket: WebSocket, subscription: StreamSubscription | None = None
+    ) -> None:
+        """Add to the broadcast set, then send the compacted current state.
+
+        Ticks are cumulative, so a snapshot of the current state is a
+        complete catch-up without replaying earlier ticks. The snapshot is
+        taken and the viewer registered in one step; frames broadcast while
+        the catch-up is in flight are queued and sent right after it.
+        """
+        self.subscribers[websocket] = subscription
+        if not self._ticked:
+            return
+        catchup = json.dumps({**self.sim.snapshot(subscription), "type": "catchup"})
+        self._catching_up[websocket] = []
+        try:
+            await websocket.send_text(catchup)
+            while queued := self._catching_up[websocket]:
+                self._catching_up[websocket] = []
+                for text in queued:
+                    await websocket.send_text(text)
+        finally:
+            self._catching_up.pop(websocket, None)
+
+    def unsubscribe(self, websocket: WebSocket) -> None:
+        self.subscribers.pop(websocket, None)
+
+    async def _run(self) -> None:
+        try:
+            current = 0.0
+            while current < self.config.sim_duration:
+                next_time = min(current + self.step_size, self.config.sim_duration)
+                self.sim.step(next_time)
+                current = next_time
+                self._ticked = True
+
+                await self._broadcast(self.sim.snapshot)
+                await asyncio.sleep(self.tick_delay)
+
+            final = self.sim.stats.compile()
+            final.run_id = store.add(final).run_id
+
+            def done(subscription: StreamSubscription | None) -> dict:
+                if subscription is None:
+                    return {"type": "done", **final.model_dump()}
+                return {
+                    "type": "done",
+                    "run_id": final.run_id,
+                    **self.sim.stats.compile_subscribed(subscription),
+                }
+
+            await self._broadcast(done)
+        except Exception as exc:
+            logger.exception("live session %r failed", self.name)
+            self.error = exc
+        finally:
+            self.finished.set()
+
+    async def _broadcast(
+        self, build: Callable[[StreamSubscription | None], dict]
+    ) -> None:
+        groups: dict[str | None, list[WebSocket]] = {}
+        subscriptions: dict[str | None, StreamSubscription | None] = {}
+        for ws, subscription in self.subscribers.items():
+            key = None if subscription is None else subscription.model_dump_json()
+            groups.setdefault(key, []).append(ws)
+            subscriptions[key] = subscription
+
+        sends, targets = [], []
+        for key, members in groups.items():
+            text = json.dumps(build(subscriptions[key]))
+            for ws in members:
+                if ws in self._catching_up:
+                    self._catching_up[ws].append(text)
+                else:
+                    sends.append(ws.send_text(text))
+                    targets.append(ws)
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        # Drop clients whose socket failed; the endpoint cleans up the rest
+        for ws, result in zip(targets, results):
+            if isinstance(result, Exception):
+                self.subscribers.pop(ws, None)
+
+
+class SessionRegistry:
+    """Named live sessions, created on first join and dropped when finished
+    or when the last viewer leaves."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, LiveSession] = {}
+
+    def get_or_create(
+        self,
+        name: str,
+        config: SimConfig,
+        tick_delay: float,
+        step_size: float,
+    ) -> LiveSession:
+        session = self._sessions.get(name)
+        if session is None or session.finished.is_set():
+            session = LiveSession(name, config, tick_delay, step_size)
+            self._sessions[name] = session
+            session.start()
+        return session
+
+    def release(self, session: LiveSession, websocket: WebSocket) -> None:
+        """Unsubscribe a client, stopping the run if nobody is left watching."""
+        session.unsubscribe(websocket)
+        if not session.subscribers:
+            session.stop()
+        if session.finished.is_set() and self._sessions.get(session.name) is session:
+            del self._sessions[session.name]
+
+    def active(self) -> list[dict]:
+        return [
+            {
+                "name": s.name,
+                "sim_time": round(s.sim_time, 1),
+                "sim_duration": s.config.sim_duration,
+                "viewers": len(s.subscribers),
+            }
+            for s in self._sessions.values()
+            if not s.finished.is_set()
+        ]
+
+
+sessions = SessionRegistry()
@@ -1,9 +1,19 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import router
+from app.simulation.replication import shutdown_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown_pool()
+
 
-app = FastAPI(title="Airport Simulation", version="0.1.0")
+app = FastAPI(title="Airport Simulation", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
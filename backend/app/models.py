@@ -3,7 +3,7 @@ from __future__ import annotations
 from enum import Enum
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class EmergencyStatus(str, Enum):
@@ -19,6 +19,17 @@ class RunwayMode(str, Enum):
     MIXED = "mixed"
 
 
+class WakeCategory(str, Enum):
+    LIGHT = "light"
+    MEDIUM = "medium"
+    HEAVY = "heavy"
+
+
+class OccupancyModel(str, Enum):
+    CONSTANT = "constant"  # every movement holds the runway for 2 minutes
+    SEPARATION = "separation"  # by wake category and preceding movement
+
+
 class RunwayStatus(str, Enum):
     AVAILABLE = "available"
     INSPECTION = "inspection"
@@ -38,11 +49,12 @@ class Aircraft(BaseModel):
     fuel_remaining: float = 40.0  # minutes of fuel
     emergency: EmergencyStatus = EmergencyStatus.NONE
     direction: Literal["inbound", "outbound"] = "inbound"
+    wake_category: WakeCategory = WakeCategory.MEDIUM
 
 
 class RunwayConfig(BaseModel):
     number: str = "01"  # two-digit runway number
-    length: float = 3000.0  # metres
+    length: float = Field(3000.0, gt=0)  # metres
     bearing: float = 90.0  # degrees
     mode: RunwayMode = RunwayMode.LANDING
     status: RunwayStatus = RunwayStatus.AVAILABLE
@@ -62,9 +74,21 @@ class SimConfig(BaseModel):
     max_wait_time: float = 30.0  # minutes before cancellation
     sim_duration: float = 120.0  # minutes
     closures: list[RunwayClosure] = Field(default_factory=list)
+    occupancy_model: OccupancyModel = OccupancyModel.CONSTANT
     seed: int | None = None  # for reproducibility
 
 
+class ImportanceBias(BaseModel):
+    """Biased sampling of inbound aircraft for rare-event estimation."""
+
+    # Multiplies every emergency probability; their 2.5% total must stay < 1.
+    # Weights are products over every draw before an outcome, so only mild
+    # biases keep the effective sample size healthy; 1.0 means no bias.
+    emergency_scale: float = Field(2.0, gt=0.0, lt=40.0)
+    # Exponential tilt of the fuel draw towards FUEL_MIN (per minute of fuel)
+    fuel_tilt: float = Field(0.0, ge=0.0)
+
+
 class AircraftLog(BaseModel):
     callsign: str
     operator: str
@@ -77,11 +101,13 @@ class AircraftLog(BaseModel):
     wait_time: float = 0.0
     delay: float = 0.0  # actual - scheduled
     emergency: EmergencyStatus = EmergencyStatus.NONE
+    wake_category: WakeCategory = WakeCategory.MEDIUM
     fuel_at_entry: float = 0.0
     outcome: Literal["landed", "departed", "diverted", "cancelled"] = "landed"
 
 
-class SimResults(BaseModel):
+class SimSummary(BaseModel):
+    run_id: str | None = None  # set once results are stored
     # Departures
     total_departures: int = 0
     total_cancellations: int = 0
@@ -99,8 +125,116 @@ class SimResults(BaseModel):
     # Time series for charts: list of [time, size] pairs
     takeoff_queue_over_time: list[list[float]] = Field(default_factory=list)
     holding_size_over_time: list[list[float]] = Field(default_factory=list)
+
+
+# Scalar per-run metrics, usable as replication targets
+SCALAR_METRICS = tuple(
+    name for name, field in SimSummary.model_fields.items()
+    if field.annotation in (int, float)
+)
+
+
+QueueSeries = Literal["takeoff_queue_over_time", "holding_size_over_time"]
+
+
+class StreamSubscription(BaseModel):
+    """What a stream client wants in each tick; the defaults send everything."""
+
+    metrics: list[str] | None = None  # scalar metrics; None for all
+    series: list[QueueSeries] | None = None  # time series; None for both
+    resolution: float | None = Field(None, gt=0.0)  # series bucket (minutes)
+    logs: bool = True  # per-aircraft logs
+
+    @field_validator("metrics")
+    @classmethod
+    def _check_metrics(cls, metrics: list[str] | None) -> list[str] | None:
+        for metric in metrics or []:
+            if metric not in SCALAR_METRICS:
+                raise ValueError(f"not a scalar result metric: {metric}")
+        return metrics
+
+
+class SimResults(SimSummary):
     # Per-aircraft logs
     landed_aircraft: list[AircraftLog] = Field(default_factory=list)
     departed_aircraft: list[AircraftLog] = Field(default_factory=list)
     diverted_aircraft: list[AircraftLog] = Field(default_factory=list)
     cancelled_aircraft: list[AircraftLog] = Field(default_factory=list)
+
+
+class LogPage(BaseModel):
+    items: list[AircraftLog] = Field(default_factory=list)
+    total: int = 0  # logs matching the filters, across all pages
+    next_cursor: str | None = None  # pass back to fetch the following page
+
+
+class ReplicationRequest(BaseModel):
+    config: SimConfig = Field(default_factory=SimConfig)
+    # Confidence half-width to reach for each metric, keyed by SimResults field
+    targets: dict[str, float] = Field(default_factory=lambda: {"avg_arrival_delay": 1.0})
+    confidence: float = Field(0.95, gt=0.0, lt=1.0)
+    batch_size: int = Field(8, ge=1, le=64)  # replications run in parallel per batch
+    min_replications: int = Field(10, ge=2, le=2000)
+    max_replications: int = Field(500, ge=2, le=2000)
+
+    @field_validator("targets")
+    @classmethod
+    def _check_targets(cls, targets: dict[str, float]) -> dict[str, float]:
+        if not targets:
+            raise ValueError("at least one target metric is required")
+        for metric, half_width in targets.items():
+            if metric not in SCALAR_METRICS:
+                raise ValueError(f"not a scalar result metric: {metric}")
+            if half_width <= 0:
+                raise ValueError(f"target half-width for {metric} must be positive")
+        return targets
+
+    @model_validator(mode="after")
+    def _check_budget(self) -> ReplicationRequest:
+        if self.min_replications > self.max_replications:
+            raise ValueError("min_replications cannot exceed max_replications")
+        return self
+
+
+class MetricEstimate(BaseModel):
+    mean: float = 0.0
+    std_dev: float = 0.0
+    half_width: float = 0.0  # confidence interval is mean ± half_width
+    target: float = 0.0
+
+
+class ReplicationResults(BaseModel):
+    replications: int = 0
+    converged: bool = False  # False if max_replications ran out first
+    confidence: float = 0.95
+    metrics: dict[str, MetricEstimate] = Field(default_factory=dict)
+
+
+class RareEventRequest(BaseModel):
+    config: SimConfig = Field(default_factory=SimConfig)
+    bias: ImportanceBias = Field(default_factory=ImportanceBias)
+    replications: int = Field(200, ge=2, le=5000)
+
+
+class RareEventEstimate(BaseModel):
+    estimate: float = 0.0  # likelihood-ratio weighted mean
+    variance: float = 0.0  # variance of the estimate itself
+    std_error: float = 0.0
+
+
+class RareEventResults(BaseModel):
+    replications: int = 0
+    aircraft: int = 0  # inbound aircraft sampled across all replications
+    # (sum w)^2 / sum w^2 over the aircraft weights; far below `aircraft`
+    # means the bias is too strong
+    effective_sample_size: float = 0.0
+    estimates: dict[str, RareEventEstimate] = Field(default_factory=dict)
+    # Set when the estimates should not be trusted (low ESS, no hits)
+    warnings: list[str] = Field(default_factory=list)
+
+
+class Prediction(BaseModel):
+    source: Literal["surrogate", "simulation"]
+    metrics: dict[str, float] = Field(default_factory=dict)
+    # Estimated absolute error per metric (surrogate answers only)
+    errors: dict[str, float] = Field(default_factory=dict)
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
+import math
+from collections.abc import Iterator
+
 import simpy
 import numpy as np
 
 from app.models import (
-    Aircraft,
-    AircraftLog,
     EmergencyStatus,
+    ImportanceBias,
+    OccupancyModel,
     RunwayClosure,
     RunwayConfig,
     RunwayMode,
     RunwayStatus,
     SimConfig,
     SimResults,
+    StreamSubscription,
 )
+from app.simulation.records import WAKE_CATEGORIES, FlightRecord, LogRecord
 from app.simulation.stats import StatisticsCollector
 
 # Constant durations (minutes)
@@ -36,26 +41,121 @@ FUEL_MIN = 20.0
 FUEL_MAX = 60.0
 FUEL_RESERVE = 10.0  # must divert before reaching this
 
+# Independent random streams, spawned from the config seed. Every aircraft
+# takes a fixed number of draws from each stream it uses, so the k-th
+# arrival or departure always gets the same values no matter what the
+# other traffic source does.
+RNG_STREAMS = (
+    "arrivals", "departures", "emergencies", "fuel", "arrival_fleet", "departure_fleet",
+)
+
+# -- Separation-based occupancy (OccupancyModel.SEPARATION) --
+
+# Movement indexes; a movement "kind" is movement * len(WAKE_CATEGORIES) + wake
+ARRIVAL = 0
+DEPARTURE = 1
+N_KINDS = 2 * len(WAKE_CATEGORIES)
+
+# Fleet mix (light, medium, heavy); sampling only needs the inner CDF steps
+FLEET_MIX = np.array([0.10, 0.70, 0.20])
+FLEET_MIX_THRESHOLDS = np.cumsum(FLEET_MIX)[:-1]
+FLEET_DRAW_BATCH = 256  # categories are drawn in vectorized blocks
+
+# Runway occupancy time (minutes) by [movement, follower wake]
+RUNWAY_OCCUPANCY = np.array([
+    [0.8, 1.0, 1.2],  # arrival: threshold to vacated
+    [0.6, 0.8, 1.0],  # departure: line-up to airborne
+])
+
+# Minimum time (minutes) from the leader's start to the follower's start,
+# by [leader movement, leader wake, follower movement, follower wake].
+# Arrival pairs follow distance spacing (3-6 NM at ~140 kt), departure
+# pairs the 1-2 minute wake rules; the follower's own occupancy still
+# applies on top of any spacing wait.
+WAKE_SEPARATION = np.array([
+    [  # leader arrival
+        [[1.3, 1.3, 1.3], [0.0, 0.0, 0.0]],  # light
+        [[2.1, 1.3, 1.3], [0.0, 0.0, 0.0]],  # medium
+        [[2.6, 2.1, 1.7], [1.0, 1.0, 1.0]],  # heavy
+    ],
+    [  # leader departure
+        [[1.0, 1.0, 1.0], [1.0, 1.0, 1.0]],  # light
+        [[1.0, 1.0, 1.0], [2.0, 1.0, 1.0]],  # medium
+        [[1.0, 1.0, 1.0], [2.0, 2.0, 1.0]],  # heavy
+    ],
+]).reshape(N_KINDS, N_KINDS)
+
+# Landings on runways shorter than this take proportionally longer to vacate
+REFERENCE_RUNWAY_LENGTH = 3000.0  # metres
+
 
 class SimRunway:
     """Wraps a SimPy PriorityResource representing a single runway."""
 
-    def __init__(self, env: simpy.Environment, config: RunwayConfig) -> None:
+    def __init__(
+        self,
+        env: simpy.Environment,
+        config: RunwayConfig,
+        occupancy_model: OccupancyModel = OccupancyModel.CONSTANT,
+    ) -> None:
         self.env = env
         self.config = config
         self.resource = simpy.PriorityResource(env, capacity=1)
 
+        self._separated = occupancy_model == OccupancyModel.SEPARATION
+        if self._separated:
+            # Precompute this runway's tables once; the hot path then only
+            # indexes flat Python lists.
+            scale = np.array([[max(1.0, REFERENCE_RUNWAY_LENGTH / config.length)], [1.0]])
+            self._occupancy: list[float] = (RUNWAY_OCCUPANCY * scale).ravel().tolist()
+            self._separation: list[list[float]] = WAKE_SEPARATION.tolist()
+        self._leader = -1  # kind of the previous movement, -1 if none yet
+        self._leader_start = 0.0
+
+    def occupancy(self, movement: int, wake: int) -> tuple[float, float]:
+        """(spacing wait, occupancy) in minutes for a movement granted the
+        runway now; the runway is held for their sum."""
+        if not self._separated:
+            return 0.0, LANDING_DURATION if movement == ARRIVAL else TAKEOFF_DURATION
+
+        kind = movement * len(WAKE_CATEGORIES) + wake
+        spacing = 0.0
+        if self._leader >= 0:
+            spacing = max(
+                0.0,
+                self._leader_start + self._separation[self._leader][kind] - self.env.now,
+            )
+        self._leader = kind
+        self._leader_start = self.env.now + spacing
+        return spacing, self._occupancy[kind]
+
 
 class AirportSimulation:
     """Discrete-event airport simulation using SimPy."""
 
-    def __init__(self, config: SimConfig) -> None:
+    def __init__(self, config: SimConfig, bias: ImportanceBias | None = None) -> None:
         self.config = config
-        self.rng = np.random.default_rng(config.seed)
+        self.rngs = {
+            name: np.random.default_rng(seq)
+            for name, seq in zip(
+                RNG_STREAMS, np.random.SeedSequence(config.seed).spawn(len(RNG_STREAMS))
+            )
+        }
+
+        # Importance sampling: inbound draws come from the biased
+        # distribution and log p/q of every draw so far accumulates here.
+        # Each aircraft's outcome is weighted by the running product at the
+        # moment the outcome is settled (a stopping time), which keeps the
+        # estimates unbiased while weighting early outcomes by fewer draws.
+        self.bias = bias
+        self.inbound_aircraft: list[FlightRecord] = []
+        self._log_ratio = 0.0
         self.env = simpy.Environment()
         self.stats = StatisticsCollector()
 
-        self.runways = [SimRunway(self.env, rc) for rc in config.runways]
+        self.runways = [
+            SimRunway(self.env, rc, config.occupancy_model) for rc in config.runways
+        ]
 
         # Track current queue sizes for stats snapshots
         self._holding_count = 0
@@ -79,14 +179,20 @@ class AirportSimulation:
         """Advance the simulation to the given time."""
         self.env.run(until=until)
 
-    def snapshot(self) -> dict:
-        """Return a lightweight snapshot of current state for streaming."""
-        results = self.stats.compile()
+    def snapshot(self, subscription: StreamSubscription | None = None) -> dict:
+        """Return a lightweight snapshot of current state for streaming.
+
+        With a subscription, only the requested parts are compiled.
+        """
+        if subscription is None:
+            data = self.stats.compile().model_dump()
+        else:
+            data = self.stats.compile_subscribed(subscription)
         return {
             "type": "tick",
             "sim_time": round(self.env.now, 1),
             "sim_duration": self.config.sim_duration,
-            **results.model_dump(),
+            **data,
         }
 
     def run(self) -> SimResults:
@@ -95,14 +201,28 @@ class AirportSimulation:
         self.step(self.config.sim_duration)
         return self.stats.compile()
 
+    def outcome_weights(self) -> list[float]:
+        """Importance weight of each inbound aircraft's outcome so far.
+
+        Aircraft still holding take the running ratio up to now, since
+        their outcome is only settled by the end of the run.
+        """
+        current = math.exp(self._log_ratio)
+        return [
+            current if a.likelihood_ratio is None else a.likelihood_ratio
+            for a in self.inbound_aircraft
+        ]
+
     # -- Aircraft generators --
 
     def _generate_arrivals(self) -> simpy.Process:
         interval = 60.0 / self.config.inbound_flow  # minutes between aircraft
+        rng = self.rngs["arrivals"]
+        wakes = self._wake_draws("arrival_fleet")
         scheduled = 0.0
         while True:
             # Actual arrival offset by N(0, σ=5), truncated
-            offset = float(self.rng.normal(0, TIME_STDDEV))
+            offset = float(rng.normal(0, TIME_STDDEV))
             offset = max(-TIME_TRUNCATE, min(TIME_TRUNCATE, offset))
             actual_entry = max(0.0, scheduled + offset)
 
@@ -111,16 +231,18 @@ class AirportSimulation:
             if wait > 0:
                 yield self.env.timeout(wait)
 
-            aircraft = self._make_aircraft(scheduled, "inbound")
+            aircraft = self._make_aircraft(scheduled, "inbound", next(wakes))
             self.env.process(self._arrival_process(aircraft, scheduled))
 
             scheduled += interval
 
     def _generate_departures(self) -> simpy.Process:
         interval = 60.0 / self.config.outbound_flow
+        rng = self.rngs["departures"]
+        wakes = self._wake_draws("departure_fleet")
         scheduled = 0.0
         while True:
-            offset = float(self.rng.normal(0, TIME_STDDEV))
+            offset = float(rng.normal(0, TIME_STDDEV))
             offset = max(-TIME_TRUNCATE, min(TIME_TRUNCATE, offset))
             actual_entry = max(0.0, scheduled + offset)
 
@@ -128,7 +250,7 @@ class AirportSimulation:
             if wait > 0:
                 yield self.env.timeout(wait)
 
-            aircraft = self._make_aircraft(scheduled, "outbound")
+            aircraft = self._make_aircraft(scheduled, "outbound", next(wakes))
             self.env.process(self._departure_process(aircraft, scheduled))
 
             scheduled += interval
@@ -136,7 +258,7 @@ class AirportSimulation:
     # -- Core processes --
 
     def _arrival_process(
-        self, aircraft: Aircraft, scheduled_time: float
+        self, aircraft: FlightRecord, scheduled_time: float
     ) -> simpy.Process:
         entry_time = self.env.now
         self._holding_count += 1
@@ -147,9 +269,9 @@ class AirportSimulation:
         runway = self._find_runway(RunwayMode.LANDING)
         if runway is None:
             # No runway available at all — immediate diversion
-            self._holding_count -= 1
+            self._leave_holding(aircraft)
             self.stats.record_diversion(
-                self._make_log(aircraft, scheduled_time, entry_time, "diverted")
+                self._make_log(aircraft, entry_time, "diverted")
             )
             return
 
@@ -165,34 +287,42 @@ class AirportSimulation:
 
         if req in result:
             # Got the runway — land
-            self._holding_count -= 1
-            yield self.env.timeout(LANDING_DURATION)
+            self._leave_holding(aircraft)
+            spacing, duration = runway.occupancy(ARRIVAL, aircraft.wake)
+            yield self.env.timeout(spacing + duration)
             runway.resource.release(req)
 
-            wait = self.env.now - entry_time - LANDING_DURATION
-            delay = self.env.now - LANDING_DURATION - scheduled_time
+            wait = self.env.now - entry_time - duration
+            delay = self.env.now - duration - scheduled_time
             log = self._make_log(
-                aircraft, scheduled_time, entry_time, "landed",
+                aircraft, entry_time, "landed",
                 exit_time=self.env.now, wait_time=wait, delay=delay,
             )
             self.stats.record_landing(log)
         else:
             # Fuel ran out — divert
-            self._holding_count -= 1
+            self._leave_holding(aircraft)
             if not req.triggered:
                 req.cancel()
             else:
                 runway.resource.release(req)
 
             log = self._make_log(
-                aircraft, scheduled_time, entry_time, "diverted",
+                aircraft, entry_time, "diverted",
                 exit_time=self.env.now,
                 wait_time=self.env.now - entry_time,
             )
             self.stats.record_diversion(log)
 
+    def _leave_holding(self, aircraft: FlightRecord) -> None:
+        """Take an aircraft off the holding stack; its outcome is now
+        decided, so under importance sampling its weight is settled."""
+        self._holding_count -= 1
+        if self.bias is not None:
+            aircraft.likelihood_ratio = math.exp(self._log_ratio)
+
     def _departure_process(
-        self, aircraft: Aircraft, scheduled_time: float
+        self, aircraft: FlightRecord, scheduled_time: float
     ) -> simpy.Process:
         entry_time = self.env.now
         self._takeoff_count += 1
@@ -203,7 +333,7 @@ class AirportSimulation:
         if runway is None:
             self._takeoff_count -= 1
             self.stats.record_cancellation(
-                self._make_log(aircraft, scheduled_time, entry_time, "cancelled")
+                self._make_log(aircraft, entry_time, "cancelled")
             )
             return
 
@@ -215,13 +345,14 @@ class AirportSimulation:
 
         if req in result:
             self._takeoff_count -= 1
-            yield self.env.timeout(TAKEOFF_DURATION)
+            spacing, duration = runway.occupancy(DEPARTURE, aircraft.wake)
+            yield self.env.timeout(spacing + duration)
             runway.resource.release(req)
 
-            wait = self.env.now - entry_time - TAKEOFF_DURATION
-            delay = self.env.now - TAKEOFF_DURATION - scheduled_time
+            wait = self.env.now - entry_time - duration
+            delay = self.env.now - duration - scheduled_time
             log = self._make_log(
-                aircraft, scheduled_time, entry_time, "departed",
+                aircraft, entry_time, "departed",
                 exit_time=self.env.now, wait_time=wait, delay=delay,
             )
             self.stats.record_departure(log)
@@ -233,7 +364,7 @@ class AirportSimulation:
                 runway.resource.release(req)
 
             log = self._make_log(
-                aircraft, scheduled_time, entry_time, "cancelled",
+                aircraft, entry_time, "cancelled",
                 exit_time=self.env.now,
                 wait_time=self.env.now - entry_time,
             )
@@ -284,26 +415,45 @@ class AirportSimulation:
         # Pick runway with fewest queued requests
         return min(candidates, key=lambda r: len(r.resource.queue))
 
+    def _wake_draws(self, stream: str) -> Iterator[int]:
+        """Endless wake category indexes from the given fleet stream,
+        sampled FLEET_DRAW_BATCH at a time."""
+        rng = self.rngs[stream]
+        while True:
+            yield from np.searchsorted(
+                FLEET_MIX_THRESHOLDS, rng.random(FLEET_DRAW_BATCH), side="right"
+            ).tolist()
+
     def _make_aircraft(
-        self, scheduled_time: float, direction: str
-    ) -> Aircraft:
-        fuel = float(self.rng.uniform(FUEL_MIN, FUEL_MAX))
+        self, scheduled_time: float, direction: str, wake: int
+    ) -> FlightRecord:
+        log_ratio = 0.0
+        if direction == "outbound":
+            fuel = float(self.rngs["departures"].uniform(FUEL_MIN, FUEL_MAX))
+        elif self.bias is not None and self.bias.fuel_tilt > 0:
+            fuel, log_ratio = self._tilted_fuel(self.bias.fuel_tilt)
+        else:
+            fuel = float(self.rngs["fuel"].uniform(FUEL_MIN, FUEL_MAX))
         callsign = f"{'ARR' if direction == 'inbound' else 'DEP'}{self._arrival_order if direction == 'inbound' else self._departure_order:04d}"
 
         # Roll for emergency status on inbound aircraft
         emergency = EmergencyStatus.NONE
         if direction == "inbound":
-            roll = float(self.rng.random())
-            if roll < EMERGENCY_MECHANICAL_PROB:
+            scale = self.bias.emergency_scale if self.bias is not None else 1.0
+            # Always draw the low-fuel value too, keeping the stream aligned
+            roll, low_fuel = self.rngs["emergencies"].random(2)
+            if roll < scale * EMERGENCY_MECHANICAL_PROB:
                 emergency = EmergencyStatus.MECHANICAL
-            elif roll < EMERGENCY_MECHANICAL_PROB + EMERGENCY_PASSENGER_PROB:
+            elif roll < scale * (EMERGENCY_MECHANICAL_PROB + EMERGENCY_PASSENGER_PROB):
                 emergency = EmergencyStatus.PASSENGER_HEALTH
-            elif roll < EMERGENCY_MECHANICAL_PROB + EMERGENCY_PASSENGER_PROB + EMERGENCY_FUEL_PROB:
+            elif roll < scale * (EMERGENCY_MECHANICAL_PROB + EMERGENCY_PASSENGER_PROB + EMERGENCY_FUEL_PROB):
                 emergency = EmergencyStatus.FUEL
                 # Fuel emergencies also come in with critically low fuel
-                fuel = float(self.rng.uniform(FUEL_RESERVE + 1, FUEL_RESERVE + 10))
+                fuel = FUEL_RESERVE + 1 + 9.0 * float(low_fuel)
+            if scale != 1.0:
+                log_ratio += _emergency_log_ratio(emergency, scale)
 
-        return Aircraft(
+        aircraft = FlightRecord(
             callsign=callsign,
             operator="SIM-AIR",
             origin="ORIG" if direction == "inbound" else "HERE",
@@ -312,30 +462,47 @@ class AirportSimulation:
             fuel_remaining=fuel,
             emergency=emergency,
             direction=direction,
+            wake=wake,
         )
+        if self.bias is not None and direction == "inbound":
+            self._log_ratio += log_ratio
+            self.inbound_aircraft.append(aircraft)
+        return aircraft
+
+    def _tilted_fuel(self, tilt: float) -> tuple[float, float]:
+        """Draw fuel from an exponential tilt of U(FUEL_MIN, FUEL_MAX) that
+        favours low fuel, by inverse CDF. Returns the fuel and its log
+        likelihood ratio."""
+        span = FUEL_MAX - FUEL_MIN
+        norm = -math.expm1(-tilt * span)  # 1 - e^(-tilt*span)
+        u = float(self.rngs["fuel"].random())
+        excess = -math.log1p(-u * norm) / tilt
+        # log p - log q, with p = 1/span and q = tilt * e^(-tilt*excess) / norm
+        return FUEL_MIN + excess, tilt * excess + math.log(norm / (tilt * span))
 
     @staticmethod
     def _make_log(
-        aircraft: Aircraft,
-        scheduled_time: float,
+        aircraft: FlightRecord,
         entry_time: float,
         outcome: str,
         exit_time: float | None = None,
         wait_time: float = 0.0,
         delay: float = 0.0,
-    ) -> AircraftLog:
-        return AircraftLog(
-            callsign=aircraft.callsign,
-            operator=aircraft.operator,
-            origin=aircraft.origin,
-            destination=aircraft.destination,
-            direction=aircraft.direction,
-            scheduled_time=scheduled_time,
+    ) -> LogRecord:
+        return LogRecord(
+            aircraft=aircraft,
             entry_time=entry_time,
             exit_time=exit_time,
             wait_time=max(0.0, wait_time),
             delay=delay,
-            emergency=aircraft.emergency,
-            fuel_at_entry=aircraft.fuel_remaining,
             outcome=outcome,
         )
+
+
+def _emergency_log_ratio(emergency: EmergencyStatus, scale: float) -> float:
+    """log p/q for one emergency roll when every emergency probability is
+    multiplied by scale under the sampling distribution q."""
+    if emergency != EmergencyStatus.NONE:
+        return -math.log(scale)
+    total = EMERGENCY_MECHANICAL_PROB + EMERGENCY_PASSENGER_PROB + EMERGENCY_FUEL_PROB
+    return math.log((1 - total) / (1 - scale * total))
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from itertools import repeat
+
+import numpy as np
+
+from app.models import (
+    EmergencyStatus,
+    ImportanceBias,
+    RareEventEstimate,
+    RareEventRequest,
+    RareEventResults,
+    SimConfig,
+)
+from app.simulation.engine import AirportSimulation
+from app.simulation.records import FlightRecord
+from app.simulation.replication import replication_configs, replication_pool
+
+# Below this effective sample size per weighted aircraft the bias is too
+# strong for the estimates to be trusted
+MIN_ESS_FRACTION = 0.1
+# Fewer sampled aircraft with an outcome than this and its estimate (and
+# especially its standard error) is unreliable
+MIN_HITS = 10
+
+# Per-aircraft outcomes whose probability for an inbound aircraft is
+# estimated, given the aircraft and whether it diverted
+RARE_EVENTS: dict[str, Callable[[FlightRecord, bool], bool]] = {
+    "diversion_probability": lambda a, diverted: diverted,
+    "emergency_diversion_probability": (
+        lambda a, diverted: diverted and a.emergency != EmergencyStatus.NONE
+    ),
+    "emergency_probability": lambda a, diverted: a.emergency != EmergencyStatus.NONE,
+}
+
+
+def estimate_rare_events(
+    request: RareEventRequest, max_workers: int | None = None
+) -> RareEventResults:
+    """Importance-sampled estimates of rare per-aircraft outcomes.
+
+    Every inbound aircraft samples its emergency and fuel from the biased
+    distribution, and each aircraft's outcome Y is weighted by the
+    likelihood ratio w = p/q of every draw made up to the moment that
+    outcome is settled (see AirportSimulation). That is a stopping time,
+    so sum(w * Y) over a run's inbound aircraft is an unbiased estimate of
+    the expected number of aircraft with outcome Y. Probabilities are the
+    ratio of those totals to the number of inbound aircraft (consistent,
+    with O(1/n) ratio bias), and expected_diversions is the per-run total.
+    Weights are products over many aircraft, so only mild biases keep the
+    effective sample size healthy; results warn when it collapses.
+    """
+    seeds = np.random.SeedSequence(request.config.seed)
+    configs = replication_configs(request.config, seeds, request.replications)
+    with replication_pool(max_workers) as pool_map:
+        runs = np.array(list(pool_map(_run_weighted, configs, repeat(request.bias))))
+
+    # Per-run columns: inbound count, sum w, sum w^2, then sum w*Y and the
+    # unweighted hit count per event
+    n = len(runs)
+    counts, weight_sums, weight_squares = runs[:, 0], runs[:, 1], runs[:, 2]
+    totals = runs[:, 3:3 + len(RARE_EVENTS)]
+    hits = runs[:, 3 + len(RARE_EVENTS):].sum(axis=0)
+    aircraft = counts.sum()
+
+    estimates = {}
+    for i, name in enumerate(RARE_EVENTS):
+        # Ratio estimator; its variance comes from the per-run residuals,
+        # which accounts for aircraft in the same run not being independent
+        p = totals[:, i].sum() / aircraft if aircraft else 0.0
+        residuals = totals[:, i] - p * counts
+        variance = float(residuals.var(ddof=1)) * n / aircraft**2 if aircraft else 0.0
+        estimates[name] = _estimate(p, variance)
+    diversions = totals[:, 0]
+    estimates["expected_diversions"] = _estimate(
+        diversions.mean(), float(diversions.var(ddof=1)) / n
+    )
+
+    ess = float(weight_sums.sum() ** 2 / weight_squares.sum()) if aircraft else 0.0
+    warnings = []
+    if ess < MIN_ESS_FRACTION * aircraft:
+        warnings.append(
+            f"effective sample size {ess:.0f} of {aircraft:.0f} weighted aircraft; "
+            "the bias is too strong and estimates are unreliable"
+        )
+    for name, count in zip(RARE_EVENTS, hits):
+        if count < MIN_HITS:
+            outcome = name.removesuffix("_probability").replace("_", " ")
+            warnings.append(
+                f"only {count:.0f} aircraft with {outcome} sampled; "
+                "the estimate is unreliable, increase replications or the bias"
+            )
+
+    return RareEventResults(
+        replications=n,
+        aircraft=int(aircraft),
+        effective_sample_size=ess,
+        estimates=estimates,
+        warnings=warnings,
+    )
+
+
+def _estimate(value: float, variance: float) -> RareEventEstimate:
+    return RareEventEstimate(
+        estimate=float(value), variance=variance, std_error=math.sqrt(variance)
+    )
+
+
+def _run_weighted(config: SimConfig, bias: ImportanceBias) -> list[float]:
+    """Worker entry point: one biased run, reduced to its inbound count,
+    sum and sum of squares of the aircraft weights, then sum(w * Y) and
+    sum(Y) for every RARE_EVENTS outcome."""
+    sim = AirportSimulation(config, bias=bias)
+    sim.run()
+    diverted = {id(log.aircraft) for log in sim.stats.diverted}
+    weights = sim.outcome_weights()
+    outcomes = [
+        [event(a, id(a) in diverted) for a in sim.inbound_aircraft]
+        for event in RARE_EVENTS.values()
+    ]
+    sums = [sum(w for w, y in zip(weights, ys) if y) for ys in outcomes]
+    counts = [sum(ys) for ys in outcomes]
+    return [len(weights), sum(weights), sum(w * w for w in weights), *sums, *counts]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+from app.models import AircraftLog, EmergencyStatus, WakeCategory
+
+# Index order of wake categories in the engine's tables and records
+WAKE_CATEGORIES = tuple(WakeCategory)
+
+
+@dataclass(slots=True)
+class FlightRecord:
+    """In-flight aircraft state used inside the engine.
+
+    A plain slotted record rather than the pydantic Aircraft model: values
+    come from the engine itself, so validation would only cost time and
+    memory on every arrival and departure.
+    """
+
+    callsign: str
+    operator: str
+    origin: str
+    destination: str
+    scheduled_time: float
+    fuel_remaining: float
+    emergency: EmergencyStatus
+    direction: Literal["inbound", "outbound"]
+    wake: int  # index into WAKE_CATEGORIES
+    # Importance sampling only: weight of this aircraft's outcome once it
+    # is settled (see AirportSimulation)
+    likelihood_ratio: float | None = None
+
+
+@dataclass(slots=True)
+class LogRecord:
+    """Outcome of one aircraft, converted to AircraftLog only when results
+    are compiled for the API."""
+
+    aircraft: FlightRecord
+    entry_time: float
+    exit_time: float | None
+    wait_time: float
+    delay: float
+    outcome: Literal["landed", "departed", "diverted", "cancelled"]
+
+    def to_model(self) -> AircraftLog:
+        aircraft = self.aircraft
+        return AircraftLog.model_construct(
+            callsign=aircraft.callsign,
+            operator=aircraft.operator,
+            origin=aircraft.origin,
+            destination=aircraft.destination,
+            direction=aircraft.direction,
+            scheduled_time=aircraft.scheduled_time,
+            entry_time=self.entry_time,
+            exit_time=self.exit_time,
+            wait_time=self.wait_time,
+            delay=self.delay,
+            emergency=aircraft.emergency,
+            wake_category=WAKE_CATEGORIES[aircraft.wake],
+            fuel_at_entry=aircraft.fuel_remaining,
+            outcome=self.outcome,
+        )
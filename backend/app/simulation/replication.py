@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from itertools import repeat
+
+import numpy as np
+from scipy.stats import t as student_t
+
+from app.models import (
+    MetricEstimate,
+    ReplicationRequest,
+    ReplicationResults,
+    SimConfig,
+)
+from app.simulation.engine import AirportSimulation
+
+
+class RunningStats:
+    """Welford's online mean/variance, updated one observation at a time."""
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value: float) -> None:
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def half_width(self, confidence: float) -> float:
+        """Student-t confidence interval half-width for the mean."""
+        if self.n < 2:
+            return math.inf
+        t = student_t.ppf((1 + confidence) / 2, self.n - 1)
+        return float(t * math.sqrt(self.variance / self.n))
+
+
+# One process pool shared by every request, created on first use, so
+# concurrent requests queue on cpu_count workers instead of each forking
+# their own pool
+_shared_pool: ProcessPoolExecutor | None = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_pool() -> ProcessPoolExecutor:
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ProcessPoolExecutor()
+        return _shared_pool
+
+
+def shutdown_pool() -> None:
+    """Shut down the shared pool (on app shutdown); the next use recreates it."""
+    global _shared_pool
+    with _shared_pool_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+@contextmanager
+def replication_pool(max_workers: int | None = None) -> Iterator[Callable]:
+    """Yield a map function that runs replications across processes.
+
+    max_workers=None uses the shared pool. max_workers=1 runs everything
+    in-process, which avoids pool start-up for small jobs and tests; any
+    other value gets a dedicated pool of that size (offline training).
+    """
+    if max_workers == 1:
+        yield map
+        return
+    if max_workers is not None:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            yield pool.map
+        return
+    pool = shared_pool()
+    try:
+        yield pool.map
+    except BrokenProcessPool:
+        # A worker died; drop the pool so the next request starts a fresh one
+        global _shared_pool
+        with _shared_pool_lock:
+            if _shared_pool is pool:
+                _shared_pool = None
+        raise
+
+
+def replication_configs(config: SimConfig, seeds: np.random.SeedSequence, n: int) -> list[SimConfig]:
+    """Copies of config with independent seeds spawned from seeds.
+
+    Spawning is deterministic, so replication i gets the same seed however
+    many batches or workers the run is split into. Each seed keeps 128 bits
+    of its child's state, so seeds do not collide across replications.
+    """
+    return [config.model_copy(update={"seed": _child_seed(child)}) for child in seeds.spawn(n)]
+
+
+def _child_seed(child: np.random.SeedSequence) -> int:
+    return int.from_bytes(child.generate_state(4).tobytes(), "little")
+
+
+def run_replications(
+    request: ReplicationRequest, max_workers: int | None = None
+) -> ReplicationResults:
+    """Run batches of replications until every target half-width is met.
+
+    After each parallel batch the running mean/variance of every target
+    metric is updated; the loop stops once all half-widths are within
+    target (and min_replications have run) or max_replications is spent.
+    """
+    metrics = list(request.targets)
+    running = {metric: RunningStats() for metric in metrics}
+    seeds = np.random.SeedSequence(request.config.seed)
+
+    done = 0
+    converged = False
+    with replication_pool(max_workers) as pool_map:
+        while done < request.max_replications:
+            batch = min(request.batch_size, request.max_replications - done)
+            configs = replication_configs(request.config, seeds, batch)
+            for values in pool_map(run_metrics, configs, repeat(metrics)):
+                for metric, value in zip(metrics, values):
+                    running[metric].push(value)
+            done += batch
+
+            if done >= request.min_replications and all(
+                running[m].half_width(request.confidence) <= request.targets[m]
+                for m in metrics
+            ):
+                converged = True
+                break
+
+    return ReplicationResults(
+        replications=done,
+        converged=converged,
+        confidence=request.confidence,
+        metrics={
+            m: MetricEstimate(
+                mean=running[m].mean,
+                std_dev=math.sqrt(running[m].variance),
+                half_width=running[m].half_width(request.confidence),
+                target=request.targets[m],
+            )
+            for m in metrics
+        },
+    )
+
+
+def run_metrics(config: SimConfig, metrics: list[str]) -> list[float]:
+    """Worker entry point: run once and return only the requested metrics,
+    so results cross the process boundary as a handful of floats."""
+    results = AirportSimulation(config).run()
+    return [float(getattr(results, m)) for m in metrics]
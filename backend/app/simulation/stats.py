@@ -1,16 +1,31 @@
 from __future__ import annotations
 
-from app.models import AircraftLog, SimResults
+from app.models import AircraftLog, SimResults, StreamSubscription
+from app.simulation.records import LogRecord
 
 
 class StatisticsCollector:
     """Records simulation events and compiles them into SimResults."""
 
     def __init__(self) -> None:
-        self._landed: list[AircraftLog] = []
-        self._departed: list[AircraftLog] = []
-        self._diverted: list[AircraftLog] = []
-        self._cancelled: list[AircraftLog] = []
+        self._landed: list[LogRecord] = []
+        self._departed: list[LogRecord] = []
+        self._diverted: list[LogRecord] = []
+        self._cancelled: list[LogRecord] = []
+
+        # AircraftLog models built so far, per record list. Records are only
+        # ever appended, so each compile() converts just the new ones.
+        self._models: dict[str, list[AircraftLog]] = {
+            "landed": [], "departed": [], "diverted": [], "cancelled": [],
+        }
+
+        # Running aggregates, so scalar metrics cost O(1) per compile
+        self._landed_waits = _Aggregate()
+        self._landed_delays = _Aggregate()
+        self._departed_waits = _Aggregate()
+        self._departed_delays = _Aggregate()
+        self._max_holding = 0
+        self._max_takeoff = 0
 
         # Time-series snapshots: (sim_time, queue_size)
         self._holding_snapshots: list[list[float]] = []
@@ -22,60 +37,127 @@ class StatisticsCollector:
 
     # -- recording methods --
 
-    def record_landing(self, log: AircraftLog) -> None:
+    def record_landing(self, log: LogRecord) -> None:
         self._landed.append(log)
+        self._landed_waits.add(log.wait_time)
+        self._landed_delays.add(log.delay)
 
-    def record_departure(self, log: AircraftLog) -> None:
+    def record_departure(self, log: LogRecord) -> None:
         self._departed.append(log)
+        self._departed_waits.add(log.wait_time)
+        self._departed_delays.add(log.delay)
 
-    def record_diversion(self, log: AircraftLog) -> None:
+    def record_diversion(self, log: LogRecord) -> None:
         self._diverted.append(log)
 
-    def record_cancellation(self, log: AircraftLog) -> None:
+    def record_cancellation(self, log: LogRecord) -> None:
         self._cancelled.append(log)
 
     def snapshot_queues(self, sim_time: float) -> None:
         self._holding_snapshots.append([sim_time, self.current_holding_size])
         self._takeoff_snapshots.append([sim_time, self.current_takeoff_queue_size])
+        self._max_holding = max(self._max_holding, self.current_holding_size)
+        self._max_takeoff = max(self._max_takeoff, self.current_takeoff_queue_size)
 
-    # -- compile --
-
-    def compile(self) -> SimResults:
-        # Arrival metrics
-        landed_waits = [a.wait_time for a in self._landed]
-        landed_delays = [a.delay for a in self._landed]
-        holding_sizes = [int(s[1]) for s in self._holding_snapshots]
+    @property
+    def diverted(self) -> list[LogRecord]:
+        """Diversion records so far, without converting them to models."""
+        return self._diverted
 
-        # Departure metrics
-        departed_waits = [a.wait_time for a in self._departed]
-        departed_delays = [a.delay for a in self._departed]
-        takeoff_sizes = [int(s[1]) for s in self._takeoff_snapshots]
+    # -- compile --
 
-        return SimResults(
+    def scalar_metrics(self) -> dict[str, float]:
+        """Every scalar SimResults metric, from the running aggregates."""
+        return {
             # Departures
-            total_departures=len(self._departed),
-            total_cancellations=len(self._cancelled),
-            max_takeoff_queue_size=max(takeoff_sizes, default=0),
-            avg_takeoff_wait=_avg(departed_waits),
-            max_takeoff_delay=max(departed_delays, default=0.0),
-            avg_takeoff_delay=_avg(departed_delays),
+            "total_departures": len(self._departed),
+            "total_cancellations": len(self._cancelled),
+            "max_takeoff_queue_size": self._max_takeoff,
+            "avg_takeoff_wait": self._departed_waits.mean(),
+            "max_takeoff_delay": self._departed_delays.max(),
+            "avg_takeoff_delay": self._departed_delays.mean(),
             # Arrivals
-            total_arrivals=len(self._landed),
-            total_diversions=len(self._diverted),
-            max_holding_size=max(holding_sizes, default=0),
-            avg_holding_time=_avg(landed_waits),
-            max_arrival_delay=max(landed_delays, default=0.0),
-            avg_arrival_delay=_avg(landed_delays),
+            "total_arrivals": len(self._landed),
+            "total_diversions": len(self._diverted),
+            "max_holding_size": self._max_holding,
+            "avg_holding_time": self._landed_waits.mean(),
+            "max_arrival_delay": self._landed_delays.max(),
+            "avg_arrival_delay": self._landed_delays.mean(),
+        }
+
+    def compile(self) -> SimResults:
+        return SimResults(
+            **self.scalar_metrics(),
             # Time series
             takeoff_queue_over_time=self._takeoff_snapshots,
             holding_size_over_time=self._holding_snapshots,
             # Logs
-            landed_aircraft=self._landed,
-            departed_aircraft=self._departed,
-            diverted_aircraft=self._diverted,
-            cancelled_aircraft=self._cancelled,
+            **self._logs(),
         )
 
+    def compile_subscribed(self, subscription: StreamSubscription) -> dict:
+        """JSON-ready subset of the compiled results: only the metrics,
+        series and logs the subscription asks for are built at all."""
+        scalars = self.scalar_metrics()
+        metrics = subscription.metrics if subscription.metrics is not None else scalars
+        data: dict = {m: scalars[m] for m in metrics}
 
-def _avg(values: list[float]) -> float:
-    return sum(values) / len(values) if values else 0.0
+        series = {
+            "takeoff_queue_over_time": self._takeoff_snapshots,
+            "holding_size_over_time": self._holding_snapshots,
+        }
+        for name in subscription.series if subscription.series is not None else series:
+            data[name] = _bucket(series[name], subscription.resolution)
+
+        if subscription.logs:
+            for field, logs in self._logs().items():
+                data[field] = [log.model_dump() for log in logs]
+        return data
+
+    def _logs(self) -> dict[str, list[AircraftLog]]:
+        return {
+            "landed_aircraft": self._to_models("landed", self._landed),
+            "departed_aircraft": self._to_models("departed", self._departed),
+            "diverted_aircraft": self._to_models("diverted", self._diverted),
+            "cancelled_aircraft": self._to_models("cancelled", self._cancelled),
+        }
+
+    def _to_models(self, outcome: str, records: list[LogRecord]) -> list[AircraftLog]:
+        models = self._models[outcome]
+        models.extend(r.to_model() for r in records[len(models):])
+        return models
+
+
+class _Aggregate:
+    """Running count, sum and max of a stream of values."""
+
+    __slots__ = ("count", "total", "largest")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.largest: float | None = None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if self.largest is None or value > self.largest:
+            self.largest = value
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def max(self) -> float:
+        return self.largest if self.largest is not None else 0.0
+
+
+def _bucket(series: list[list[float]], resolution: float | None) -> list[list[float]]:
+    """Downsample [time, size] samples to the largest size per bucket of
+    `resolution` minutes, stamped with the bucket start."""
+    if resolution is None:
+        return series
+    buckets: dict[float, float] = {}
+    for t, size in series:
+        start = (t // resolution) * resolution
+        buckets[start] = max(buckets.get(start, size), size)
+    return [[t, size] for t, size in buckets.items()]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Literal, get_args
+
+import numpy as np
+
+from app.models import AircraftLog, EmergencyStatus, LogPage, SimResults, SimSummary
+
+MAX_STORED_RUNS = 100  # oldest runs are evicted beyond this
+
+LOG_FIELDS = ("landed_aircraft", "departed_aircraft", "diverted_aircraft", "cancelled_aircraft")
+SortField = Literal["scheduled_time", "entry_time", "exit_time", "wait_time", "delay"]
+SORT_FIELDS: tuple[str, ...] = get_args(SortField)
+
+
+class StoredRun:
+    """Compiled results of one run, with column indexes over its logs.
+
+    Logs are immutable once stored, so every index is built up front:
+    a boolean mask per outcome and emergency status, and one sort order
+    per sortable field (both directions).
+    """
+
+    def __init__(self, run_id: str, results: SimResults) -> None:
+        self.run_id = run_id
+        self.summary = SimSummary(
+            **results.model_dump(exclude={"run_id", *LOG_FIELDS}), run_id=run_id
+        )
+        self.logs: list[AircraftLog] = [
+            log for field in LOG_FIELDS for log in getattr(results, field)
+        ]
+
+        self._columns = {
+            field: np.array(
+                [np.nan if getattr(log, field) is None else getattr(log, field) for log in self.logs],
+                dtype=float,
+            )
+            for field in SORT_FIELDS
+        }
+        outcomes = np.array([log.outcome for log in self.logs], dtype=object)
+        emergencies = np.array([log.emergency.value for log in self.logs], dtype=object)
+        self._by_outcome = {
+            outcome: outcomes == outcome
+            for outcome in ("landed", "departed", "diverted", "cancelled")
+        }
+        self._by_emergency = {status: emergencies == status.value for status in EmergencyStatus}
+
+        # Stable sorts keep ties in log order; NaN (no exit_time) sorts last either way
+        self._orders: dict[tuple[str, bool], np.ndarray] = {}
+        for field in SORT_FIELDS:
+            values = self._columns[field]
+            self._orders[(field, False)] = np.argsort(values, kind="stable")
+            self._orders[(field, True)] = np.argsort(-values, kind="stable")
+
+    def query(
+        self,
+        outcomes: list[str] | None = None,
+        emergencies: list[EmergencyStatus] | None = None,
+        from_time: float | None = None,
+        to_time: float | None = None,
+        min_delay: float | None = None,
+        sort: SortField = "scheduled_time",
+        descending: bool = False,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> LogPage:
+        """Return one page of logs matching every given filter.
+
+        The time window applies to entry_time. The cursor is the position in
+        the chosen sort order to resume from, as returned in next_cursor.
+        """
+        mask = np.ones(len(self.logs), dtype=bool)
+        if outcomes:
+            mask &= np.logical_or.reduce([self._by_outcome[o] for o in outcomes])
+        if emergencies:
+            mask &= np.logical_or.reduce([self._by_emergency[e] for e in emergencies])
+        if from_time is not None or to_time is not None:
+            mask &= self._range("entry_time", from_time, to_time)
+        if min_delay is not None:
+            mask &= self._range("delay", min_delay, None)
+
+        start = _decode_cursor(cursor)
+        order = self._orders[(sort, descending)][start:]
+        hits = np.flatnonzero(mask[order])[: limit + 1]
+
+        next_cursor = None
+        if len(hits) > limit:
+            next_cursor = str(start + int(hits[limit - 1]) + 1)
+        return LogPage(
+            items=[self.logs[i] for i in order[hits[:limit]]],
+            total=int(mask.sum()),
+            next_cursor=next_cursor,
+        )
+
+    def _range(self, field: str, low: float | None, high: float | None) -> np.ndarray:
+        """Mask of rows with low <= field <= high, located by binary search
+        on the ascending sort order."""
+        order = self._orders[(field, False)]
+        values = self._columns[field][order]
+        lo = 0 if low is None else int(np.searchsorted(values, low, side="left"))
+        hi = len(values) if high is None else int(np.searchsorted(values, high, side="right"))
+        mask = np.zeros(len(self.logs), dtype=bool)
+        mask[order[lo:hi]] = True
+        return mask
+
+
+class ResultStore:
+    """In-memory store of compiled runs keyed by run ID (LRU-evicted).
+
+    Used from both threadpool endpoints and the event loop, so every
+    access to the LRU order goes through a lock.
+    """
+
+    def __init__(self, max_runs: int = MAX_STORED_RUNS) -> None:
+        self.max_runs = max_runs
+        self._runs: OrderedDict[str, StoredRun] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, results: SimResults) -> StoredRun:
+        # Build the indexes outside the lock; only the insert is shared
+        run = StoredRun(uuid.uuid4().hex, results)
+        with self._lock:
+            self._runs[run.run_id] = run
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+        return run
+
+    def get(self, run_id: str) -> StoredRun | None:
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is not None:
+                self._runs.move_to_end(run_id)
+        return run
+
+
+def _decode_cursor(cursor: str | None) -> int:
+    if cursor is None:
+        return 0
+    try:
+        position = int(cursor)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+    if position < 0:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return position
+
+
+store = ResultStore()
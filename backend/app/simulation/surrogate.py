@@ -0,0 +1,238 @@
+"""Interpolating surrogate of the simulation for instant approximate results.
+
+Trained offline by running replications over a grid of
+(inbound_flow, outbound_flow, max_wait_time) for each runway layout, then
+queried by multilinear interpolation. Train with:
+
+    python -m app.simulation.surrogate surrogate.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+
+from app.models import (
+    SCALAR_METRICS,
+    OccupancyModel,
+    Prediction,
+    RunwayConfig,
+    RunwayMode,
+    RunwayStatus,
+    SimConfig,
+)
+from app.simulation.replication import run_metrics, replication_configs, replication_pool
+
+SURROGATE_PATH = os.environ.get("AIRPORT_SIM_SURROGATE", "surrogate.npz")
+
+# Default training grid
+INBOUND_AXIS = np.arange(0.0, 61.0, 5.0)
+OUTBOUND_AXIS = np.arange(0.0, 61.0, 5.0)
+MAX_WAIT_AXIS = np.array([10.0, 20.0, 30.0, 45.0, 60.0])
+# (landing, takeoff, mixed) runway counts
+LAYOUTS = [(0, 0, 1), (1, 1, 0), (0, 0, 2), (1, 0, 1), (0, 1, 1), (2, 2, 0)]
+REPLICATIONS = 5
+
+Layout = tuple[int, int, int]
+
+
+def layout_of(config: SimConfig) -> Layout:
+    modes = [rw.mode for rw in config.runways]
+    return (
+        modes.count(RunwayMode.LANDING),
+        modes.count(RunwayMode.TAKEOFF),
+        modes.count(RunwayMode.MIXED),
+    )
+
+
+class Surrogate:
+    """Per-layout grids of mean metrics and error estimates."""
+
+    def __init__(
+        self,
+        axes: tuple[np.ndarray, np.ndarray, np.ndarray],
+        sim_duration: float,
+        layouts: list[Layout],
+        mean: np.ndarray,
+        error: np.ndarray,
+        metrics: tuple[str, ...] = SCALAR_METRICS,
+    ) -> None:
+        self.axes = axes
+        self.sim_duration = sim_duration
+        self.metrics = metrics
+        # mean/error have shape (layout, inbound, outbound, max_wait, metric)
+        self._layout_index = {tuple(layout): i for i, layout in enumerate(layouts)}
+        self._mean = mean
+        self._error = error
+
+    def covers(self, config: SimConfig) -> bool:
+        """Whether config lies inside the region the surrogate was trained on."""
+        if config.closures or config.sim_duration != self.sim_duration:
+            return False
+        if config.occupancy_model != OccupancyModel.CONSTANT:
+            return False
+        if any(rw.status != RunwayStatus.AVAILABLE for rw in config.runways):
+            return False
+        if layout_of(config) not in self._layout_index:
+            return False
+        point = (config.inbound_flow, config.outbound_flow, config.max_wait_time)
+        return all(axis[0] <= x <= axis[-1] for axis, x in zip(self.axes, point))
+
+    def predict(self, config: SimConfig) -> Prediction | None:
+        """Interpolated metrics, or None if config is outside the trained region."""
+        if not self.covers(config):
+            return None
+        layout = self._layout_index[layout_of(config)]
+        point = (config.inbound_flow, config.outbound_flow, config.max_wait_time)
+
+        # Multilinear interpolation: blend the 8 surrounding grid nodes
+        lows, fracs = [], []
+        for axis, x in zip(self.axes, point):
+            i = min(int(np.searchsorted(axis, x, side="right")) - 1, len(axis) - 2)
+            lows.append(i)
+            fracs.append((x - axis[i]) / (axis[i + 1] - axis[i]))
+        i, j, k = lows
+        mean_cell = self._mean[layout, i:i + 2, j:j + 2, k:k + 2]
+        error_cell = self._error[layout, i:i + 2, j:j + 2, k:k + 2]
+        w = np.einsum(
+            "i,j,k->ijk",
+            [1 - fracs[0], fracs[0]],
+            [1 - fracs[1], fracs[1]],
+            [1 - fracs[2], fracs[2]],
+        )
+        mean = np.tensordot(w, mean_cell, axes=3)
+        error = np.tensordot(w, error_cell, axes=3)
+        return Prediction(
+            source="surrogate",
+            metrics=dict(zip(self.metrics, mean.tolist())),
+            errors=dict(zip(self.metrics, error.tolist())),
+        )
+
+    def save(self, path: str | Path) -> None:
+        np.savez_compressed(
+            path,
+            inbound=self.axes[0],
+            outbound=self.axes[1],
+            max_wait=self.axes[2],
+            sim_duration=self.sim_duration,
+            layouts=np.array(list(self._layout_index), dtype=int),
+            metrics=np.array(self.metrics),
+            mean=self._mean,
+            error=self._error,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> Surrogate | None:
+        """Load a trained surrogate, or None if there is no file at path."""
+        if not Path(path).is_file():
+            return None
+        data = np.load(path)
+        return cls(
+            axes=(data["inbound"], data["outbound"], data["max_wait"]),
+            sim_duration=float(data["sim_duration"]),
+            layouts=[tuple(int(n) for n in row) for row in data["layouts"]],
+            mean=data["mean"],
+            error=data["error"],
+            metrics=tuple(str(m) for m in data["metrics"]),
+        )
+
+
+def train(
+    inbound: np.ndarray = INBOUND_AXIS,
+    outbound: np.ndarray = OUTBOUND_AXIS,
+    max_wait: np.ndarray = MAX_WAIT_AXIS,
+    layouts: list[Layout] = LAYOUTS,
+    sim_duration: float = 120.0,
+    replications: int = REPLICATIONS,
+    seed: int = 0,
+    max_workers: int | None = None,
+) -> Surrogate:
+    """Run `replications` seeds at every grid node and fit the surrogate.
+
+    The error estimate at each node combines the standard error of the
+    replication mean with the local curvature (how far the node sits from
+    the average of its neighbours), which bounds the interpolation error.
+    """
+    axes = (np.asarray(inbound, float), np.asarray(outbound, float), np.asarray(max_wait, float))
+    if any(len(axis) < 2 for axis in axes):
+        raise ValueError("every grid axis needs at least two points")
+    metrics = list(SCALAR_METRICS)
+    seeds = np.random.SeedSequence(seed)
+
+    configs = []
+    for layout, fin, fout, wait in itertools.product(layouts, *axes):
+        base = SimConfig(
+            runways=_layout_runways(layout),
+            inbound_flow=fin,
+            outbound_flow=fout,
+            max_wait_time=wait,
+            sim_duration=sim_duration,
+        )
+        configs += replication_configs(base, seeds, replications)
+
+    with replication_pool(max_workers) as pool_map:
+        values = np.array(list(pool_map(run_metrics, configs, repeat(metrics))))
+
+    shape = (len(layouts), *(len(a) for a in axes), replications, len(metrics))
+    values = values.reshape(shape)
+    mean = values.mean(axis=4)
+    std_error = values.std(axis=4, ddof=1) / np.sqrt(replications) if replications > 1 else 0.0
+    error = np.sqrt(std_error**2 + _curvature(mean) ** 2)
+    return Surrogate(axes, sim_duration, layouts, mean, error, tuple(metrics))
+
+
+def _layout_runways(layout: Layout) -> list[RunwayConfig]:
+    landing, takeoff, mixed = layout
+    return (
+        [RunwayConfig(mode=RunwayMode.LANDING)] * landing
+        + [RunwayConfig(mode=RunwayMode.TAKEOFF)] * takeoff
+        + [RunwayConfig(mode=RunwayMode.MIXED)] * mixed
+    )
+
+
+def _curvature(mean: np.ndarray) -> np.ndarray:
+    """Largest second difference along any grid axis, per node.
+
+    Axes 1-3 are the grid axes; edge nodes take their neighbour's value.
+    """
+    curvature = np.zeros_like(mean)
+    for axis in (1, 2, 3):
+        if mean.shape[axis] < 3:
+            continue
+        n = mean.shape[axis]
+        lo = np.take(mean, range(0, n - 2), axis=axis)
+        mid = np.take(mean, range(1, n - 1), axis=axis)
+        hi = np.take(mean, range(2, n), axis=axis)
+        second = np.abs(mid - (lo + hi) / 2)
+        padded = np.concatenate(
+            [np.take(second, [0], axis=axis), second, np.take(second, [-1], axis=axis)],
+            axis=axis,
+        )
+        curvature = np.maximum(curvature, padded)
+    return curvature
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train the simulation surrogate.")
+    parser.add_argument("output", nargs="?", default=SURROGATE_PATH)
+    parser.add_argument("--replications", type=int, default=REPLICATIONS)
+    parser.add_argument("--sim-duration", type=float, default=120.0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    surrogate = train(
+        sim_duration=args.sim_duration,
+        replications=args.replications,
+        max_workers=args.workers,
+    )
+    surrogate.save(args.output)
+    print(f"Saved surrogate to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
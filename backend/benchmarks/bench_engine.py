@@ -0,0 +1,103 @@
+"""Engine hot-path benchmark: memory per aircraft and time per SimPy event,
+plus the cost of separation-based runway occupancy relative to the
+constant-duration model (exits non-zero if it exceeds MAX_SEPARATION_SLOWDOWN).
+
+Run from backend/:
+
+    python benchmarks/bench_engine.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+import simpy
+
+from app.models import OccupancyModel, RunwayConfig, RunwayMode, SimConfig
+from app.simulation.engine import AirportSimulation
+
+CONFIG = SimConfig(
+    runways=[
+        RunwayConfig(mode=RunwayMode.LANDING),
+        RunwayConfig(mode=RunwayMode.LANDING),
+        RunwayConfig(mode=RunwayMode.TAKEOFF),
+        RunwayConfig(mode=RunwayMode.TAKEOFF),
+    ],
+    inbound_flow=50,
+    outbound_flow=50,
+    sim_duration=24 * 60,
+    seed=1,
+)
+REPEATS = 5
+# Allowed per-aircraft time of the separation model vs constant durations
+MAX_SEPARATION_SLOWDOWN = 1.25
+
+
+def count_aircraft(sim: AirportSimulation) -> int:
+    stats = sim.stats
+    return len(stats._landed) + len(stats._departed) + len(stats._diverted) + len(stats._cancelled)
+
+
+def count_events(config: SimConfig) -> int:
+    """Events scheduled in one run (counted on a separate, untimed run)."""
+    sim = AirportSimulation(config)
+    count = 0
+    schedule = sim.env.schedule
+
+    def counting_schedule(event: simpy.Event, *args, **kwargs) -> None:
+        nonlocal count
+        count += 1
+        schedule(event, *args, **kwargs)
+
+    sim.env.schedule = counting_schedule
+    sim.setup()
+    sim.step(config.sim_duration)
+    return count
+
+
+def bytes_per_aircraft(config: SimConfig) -> float:
+    """Memory retained by a finished run's records, per aircraft (before
+    compiling results for the API)."""
+    tracemalloc.start()
+    sim = AirportSimulation(config)
+    sim.setup()
+    sim.step(config.sim_duration)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained / count_aircraft(sim)
+
+
+def seconds_per_run(config: SimConfig) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(REPEATS):
+        sim = AirportSimulation(config)
+        start = time.perf_counter()
+        sim.setup()
+        sim.step(config.sim_duration)
+        best = min(best, time.perf_counter() - start)
+    return best, count_aircraft(sim)
+
+
+def main() -> None:
+    seconds, aircraft = seconds_per_run(CONFIG)
+    events = count_events(CONFIG)
+    print(f"aircraft per run:    {aircraft}")
+    print(f"events per run:      {events}")
+    print(f"run time (best/{REPEATS}):  {seconds * 1e3:.1f} ms")
+    print(f"time per event:      {seconds / events * 1e6:.2f} us")
+    print(f"time per aircraft:   {seconds / aircraft * 1e6:.2f} us")
+    print(f"bytes per aircraft:  {bytes_per_aircraft(CONFIG):.0f}")
+
+    separated = CONFIG.model_copy(update={"occupancy_model": OccupancyModel.SEPARATION})
+    sep_seconds, sep_aircraft = seconds_per_run(separated)
+    slowdown = (sep_seconds / sep_aircraft) / (seconds / aircraft)
+    print(f"separation model:    {sep_seconds / sep_aircraft * 1e6:.2f} us/aircraft "
+          f"({slowdown:.2f}x constant, limit {MAX_SEPARATION_SLOWDOWN}x)")
+    if slowdown > MAX_SEPARATION_SLOWDOWN:
+        sys.exit("separation occupancy model is too slow")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""Load test for the websocket and REST endpoints.
+
+Ramps concurrent /simulate/stream sessions and /simulate requests with
+varied SimConfigs and reports tick lateness percentiles, late and dropped
+frames, request throughput/latency, and server CPU and RSS.
+
+By default a uvicorn server is started on loopback in a subprocess, so its
+CPU and memory can be read from /proc without counting the clients. Pass
+--url to target a running server instead (no CPU/RSS then).
+
+Run from backend/:
+
+    python benchmarks/loadtest.py --levels 1,10,50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+
+import httpx
+import numpy as np
+from websockets.asyncio.client import connect
+
+from app.api.routes import STREAM_STEP_SIZE, STREAM_TICK_DELAY
+from app.models import RunwayConfig, RunwayMode, SimConfig
+
+LEVELS = (1, 5, 10, 25)
+SIM_DURATION = 60.0  # sim-minutes per streamed session
+REST_SECONDS = 5.0  # how long each REST phase keeps firing requests
+# A tick arriving this much later than the server's tick delay counts as late
+LATE_THRESHOLD = 0.05  # seconds
+
+
+@dataclass
+class ServerUsage:
+    cpu_seconds: float = 0.0
+    rss_mb: float = 0.0
+
+
+@dataclass
+class LevelReport:
+    concurrency: int
+    sessions_failed: int = 0
+    ticks: int = 0
+    late_frames: int = 0
+    dropped_frames: int = 0
+    tick_lateness_ms: dict[str, float] = field(default_factory=dict)
+    stream_cpu_pct: float | None = None
+    requests: int = 0
+    requests_failed: int = 0
+    requests_per_second: float = 0.0
+    request_latency_ms: dict[str, float] = field(default_factory=dict)
+    rest_cpu_pct: float | None = None
+    server_rss_mb: float | None = None
+
+
+class LocalServer:
+    """uvicorn serving app.main:app on a free loopback port."""
+
+    def __init__(self) -> None:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._proc: subprocess.Popen | None = None
+
+    def __enter__(self) -> LocalServer:
+        self._proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app",
+             "--host", "127.0.0.1", "--port", str(self.port), "--log-level", "warning"],
+        )
+        deadline = time.monotonic() + 15
+        while time.monotonic() < deadline:
+            try:
+                if httpx.get(f"{self.url}/health").status_code == 200:
+                    return self
+            except httpx.TransportError:
+                time.sleep(0.1)
+        self.__exit__()
+        raise RuntimeError("server did not start")
+
+    def __exit__(self, *exc: object) -> None:
+        if self._proc is not None:
+            self._proc.terminate()
+            self._proc.wait()
+
+    def usage(self) -> ServerUsage:
+        """CPU time and RSS of the server process, read from /proc."""
+        pid = self._proc.pid
+        with open(f"/proc/{pid}/stat") as f:
+            # Fields after the ")" that ends the command name; utime/stime are 14/15
+            fields = f.read().rsplit(")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        cpu = (int(fields[11]) + int(fields[12])) / ticks
+        rss_kb = 0
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss_kb = int(line.split()[1])
+        return ServerUsage(cpu_seconds=cpu, rss_mb=rss_kb / 1024)
+
+
+def varied_config(rng: np.random.Generator) -> SimConfig:
+    """A random but realistic SimConfig, so sessions do uneven work."""
+    layouts = [
+        [RunwayMode.MIXED],
+        [RunwayMode.LANDING, RunwayMode.TAKEOFF],
+        [RunwayMode.MIXED, RunwayMode.MIXED],
+        [RunwayMode.LANDING, RunwayMode.LANDING, RunwayMode.TAKEOFF, RunwayMode.TAKEOFF],
+    ]
+    modes = layouts[rng.integers(len(layouts))]
+    return SimConfig(
+        runways=[RunwayConfig(mode=m) for m in modes],
+        inbound_flow=float(rng.uniform(5, 60)),
+        outbound_flow=float(rng.uniform(5, 60)),
+        max_wait_time=float(rng.choice([15, 30, 45])),
+        sim_duration=SIM_DURATION,
+        seed=int(rng.integers(2**31)),
+    )
+
+
+@dataclass
+class SessionResult:
+    lateness: list[float]  # seconds beyond the tick delay, per tick after the first
+    ticks: int
+    missing: int  # expected ticks that never arrived
+    ok: bool
+
+
+async def stream_session(url: str, config: SimConfig) -> SessionResult:
+    """Run one /simulate/stream session, timing every tick."""
+    ws_url = url.replace("http", "ws", 1) + "/simulate/stream"
+    expected = int(np.ceil(config.sim_duration / STREAM_STEP_SIZE))
+    lateness: list[float] = []
+    ticks = 0
+    try:
+        async with connect(ws_url, max_size=None) as ws:
+            await ws.send(config.model_dump_json())
+            last = None
+            async for raw in ws:
+                now = time.perf_counter()
+                message = json.loads(raw)
+                if message["type"] == "done":
+                    break
+                ticks += 1
+                if last is not None:
+                    lateness.append(max(0.0, now - last - STREAM_TICK_DELAY))
+                last = now
+    except Exception:
+        return SessionResult(lateness, ticks, expected - ticks, ok=False)
+    return SessionResult(lateness, ticks, expected - ticks, ok=True)
+
+
+async def rest_worker(
+    client: httpx.AsyncClient, rng: np.random.Generator, deadline: float
+) -> tuple[list[float], int]:
+    latencies, failures = [], 0
+    while time.perf_counter() < deadline:
+        config = varied_config(rng)
+        start = time.perf_counter()
+        try:
+            resp = await client.post("/simulate", json=config.model_dump(mode="json"))
+            resp.raise_for_status()
+        except httpx.HTTPError:
+            failures += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+    return latencies, failures
+
+
+async def run_level(
+    url: str, concurrency: int, rest_seconds: float, server: LocalServer | None, seed: int
+) -> LevelReport:
+    rng = np.random.default_rng(seed)
+    report = LevelReport(concurrency=concurrency)
+
+    # Websocket phase
+    before, start = server.usage() if server else None, time.perf_counter()
+    sessions = await asyncio.gather(
+        *(stream_session(url, varied_config(rng)) for _ in range(concurrency))
+    )
+    elapsed = time.perf_counter() - start
+    if server:
+        report.stream_cpu_pct = _cpu_pct(before, server.usage(), elapsed)
+
+    lateness = [x for s in sessions for x in s.lateness]
+    report.ticks = sum(s.ticks for s in sessions)
+    report.late_frames = sum(x > LATE_THRESHOLD for x in lateness)
+    report.dropped_frames = sum(max(0, s.missing) for s in sessions)
+    report.sessions_failed = sum(not s.ok for s in sessions)
+    report.tick_lateness_ms = _percentiles(lateness)
+
+    # REST phase
+    before, start = server.usage() if server else None, time.perf_counter()
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        deadline = start + rest_seconds
+        workers = await asyncio.gather(
+            *(rest_worker(client, np.random.default_rng(seed + i + 1), deadline)
+              for i in range(concurrency))
+        )
+    elapsed = time.perf_counter() - start
+    if server:
+        after = server.usage()
+        report.rest_cpu_pct = _cpu_pct(before, after, elapsed)
+        report.server_rss_mb = after.rss_mb
+
+    latencies = [x for worker_latencies, _ in workers for x in worker_latencies]
+    report.requests = len(latencies)
+    report.requests_failed = sum(f for _, f in workers)
+    report.requests_per_second = len(latencies) / elapsed
+    report.request_latency_ms = _percentiles(latencies)
+    return report
+
+
+def _percentiles(seconds: list[float]) -> dict[str, float]:
+    if not seconds:
+        return {}
+    values = np.percentile(np.array(seconds) * 1e3, [50, 95, 99])
+    return {"p50": float(values[0]), "p95": float(values[1]), "p99": float(values[2])}
+
+
+def _cpu_pct(before: ServerUsage, after: ServerUsage, elapsed: float) -> float:
+    return 100.0 * (after.cpu_seconds - before.cpu_seconds) / elapsed
+
+
+def print_report(reports: list[LevelReport]) -> None:
+    def fmt(value: float | None, spec: str = ".1f") -> str:
+        return "-" if value is None else format(value, spec)
+
+    header = (
+        f"{'conc':>5} {'ticks':>7} {'late':>5} {'drop':>5} {'fail':>4} "
+        f"{'tick p50/p95/p99 ms':>21} {'ws cpu%':>8} "
+        f"{'req':>6} {'req/s':>7} {'req p50/p95/p99 ms':>22} {'rest cpu%':>9} {'rss MB':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in reports:
+        tick = "/".join(fmt(r.tick_lateness_ms.get(p)) for p in ("p50", "p95", "p99"))
+        req = "/".join(fmt(r.request_latency_ms.get(p), ".0f") for p in ("p50", "p95", "p99"))
+        print(
+            f"{r.concurrency:>5} {r.ticks:>7} {r.late_frames:>5} {r.dropped_frames:>5} "
+            f"{r.sessions_failed + r.requests_failed:>4} {tick:>21} {fmt(r.stream_cpu_pct):>8} "
+            f"{r.requests:>6} {r.requests_per_second:>7.1f} {req:>22} "
+            f"{fmt(r.rest_cpu_pct):>9} {fmt(r.server_rss_mb):>7}"
+        )
+
+
+async def run(url: str, levels: list[int], rest_seconds: float, server: LocalServer | None) -> list[LevelReport]:
+    reports = []
+    for i, level in enumerate(levels):
+        reports.append(await run_level(url, level, rest_seconds, server, seed=1000 * i))
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the simulation API.")
+    parser.add_argument("--url", help="target a running server instead of starting one")
+    parser.add_argument(
+        "--levels", default=",".join(map(str, LEVELS)),
+        help="comma-separated concurrency levels to ramp through",
+    )
+    parser.add_argument("--rest-seconds", type=float, default=REST_SECONDS)
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.levels.split(",")]
+
+    if args.url:
+        reports = asyncio.run(run(args.url.rstrip("/"), levels, args.rest_seconds, None))
+    else:
+        with LocalServer() as server:
+            reports = asyncio.run(run(server.url, levels, args.rest_seconds, server))
+
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+    else:
+        print_report(reports)
+
+
+if __name__ == "__main__":
+    main()
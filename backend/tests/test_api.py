@@ -1,7 +1,18 @@
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import WebSocketDisconnect
 from fastapi.testclient import TestClient
 
+from app.api import routes
+from app.api import sessions as sessions_module
 from app.main import app
 from app.models import RunwayConfig, RunwayMode, SimConfig
+from app.simulation.engine import AirportSimulation
+from app.simulation.store import ResultStore
 
 client = TestClient(app)
 
@@ -52,3 +63,278 @@ def test_simulate_with_closure():
 def test_simulate_invalid_config():
     resp = client.post("/simulate", json={"runways": "bad"})
     assert resp.status_code == 422
+
+
+def test_simulate_rejects_zero_length_runway():
+    config = {"runways": [{"length": 0}], "occupancy_model": "separation"}
+    resp = client.post("/simulate", json=config)
+    assert resp.status_code == 422
+
+
+class TestLiveSessions:
+    CONFIG = {"runways": [{"mode": "mixed"}], "sim_duration": 20, "seed": 7}
+
+    @pytest.fixture(autouse=True)
+    def fast_ticks(self, monkeypatch):
+        monkeypatch.setattr(routes, "STREAM_TICK_DELAY", 0.001)
+
+    @staticmethod
+    def _read_until_done(ws) -> list[dict]:
+        messages = []
+        while True:
+            msg = ws.receive_json()
+            messages.append(msg)
+            if msg["type"] == "done":
+                return messages
+
+    def test_viewers_share_one_run(self, monkeypatch):
+        built = []
+
+        class CountingSimulation(AirportSimulation):
+            def __init__(self, config):
+                built.append(config)
+                super().__init__(config)
+
+        monkeypatch.setattr(sessions_module, "AirportSimulation", CountingSimulation)
+        monkeypatch.setattr(routes, "STREAM_TICK_DELAY", 0.01)
+
+        with TestClient(app) as c:
+            with c.websocket_connect("/simulate/live/shared") as a, \
+                    c.websocket_connect("/simulate/live/shared") as b:
+                a.send_json(self.CONFIG)
+                assert a.receive_json()["type"] == "tick"
+                b.send_json(self.CONFIG)
+                done_a = self._read_until_done(a)[-1]
+                done_b = self._read_until_done(b)[-1]
+
+        assert len(built) == 1
+        assert done_a == done_b
+
+    def test_late_joiner_gets_catchup(self):
+        with TestClient(app) as c:
+            with c.websocket_connect("/simulate/live/late") as first:
+                first.send_json(self.CONFIG)
+                for _ in range(3):
+                    first.receive_json()
+                with c.websocket_connect("/simulate/live/late") as late:
+                    late.send_json({})
+                    catchup = late.receive_json()
+                    assert catchup["type"] == "catchup"
+                    assert catchup["sim_time"] >= 3
+                    assert self._read_until_done(late)[-1]["type"] == "done"
+
+    def test_frames_during_catchup_are_not_lost(self):
+        class SlowSocket:
+            """Blocks on its first send (the catch-up) until released."""
+
+            def __init__(self):
+                self.release = asyncio.Event()
+                self.sent = []
+
+            async def send_text(self, text):
+                if not self.sent:
+                    self.sent.append(json.loads(text)["type"])
+                    await self.release.wait()
+                else:
+                    self.sent.append(json.loads(text)["type"])
+
+        async def scenario():
+            session = sessions_module.LiveSession(
+                "slow", SimConfig(**self.CONFIG), tick_delay=0, step_size=1
+            )
+            session.start()
+            while not session._ticked:
+                await asyncio.sleep(0)
+            late = SlowSocket()
+            joining = asyncio.create_task(session.subscribe(late))
+            # The run finishes while the catch-up send is still blocked
+            await session.finished.wait()
+            late.release.set()
+            await joining
+            return late.sent
+
+        sent = asyncio.run(scenario())
+        assert sent[0] == "catchup"
+        assert sent[-1] == "done"
+        assert "tick" in sent
+
+    def test_viewers_get_their_own_subscription(self):
+        light = {"metrics": ["total_arrivals"], "series": [], "logs": False}
+        with TestClient(app) as c:
+            with c.websocket_connect("/simulate/live/subs") as full, \
+                    c.websocket_connect("/simulate/live/subs") as lean:
+                full.send_json(self.CONFIG)
+                lean.send_json({**self.CONFIG, "subscription": light})
+                done_full = self._read_until_done(full)[-1]
+                done_lean = self._read_until_done(lean)[-1]
+        assert "landed_aircraft" in done_full
+        assert set(done_lean) == {"type", "run_id", "total_arrivals"}
+        assert done_lean["total_arrivals"] == done_full["total_arrivals"]
+
+    def test_failed_run_closes_viewers_with_error(self, monkeypatch):
+        class FailingSimulation(AirportSimulation):
+            def step(self, until):
+                if until > 2:
+                    raise RuntimeError("boom")
+                super().step(until)
+
+        monkeypatch.setattr(sessions_module, "AirportSimulation", FailingSimulation)
+        with TestClient(app) as c:
+            with c.websocket_connect("/simulate/live/broken") as ws:
+                ws.send_json(self.CONFIG)
+                with pytest.raises(WebSocketDisconnect) as exc:
+                    while True:
+                        assert ws.receive_json()["type"] == "tick"
+                assert exc.value.code == 1011
+
+    def test_session_dropped_after_run(self):
+        with TestClient(app) as c:
+            with c.websocket_connect("/simulate/live/gone") as ws:
+                ws.send_json(self.CONFIG)
+                self._read_until_done(ws)
+            assert all(s["name"] != "gone" for s in c.get("/simulate/live").json())
+
+
+class TestStoredRuns:
+    CONFIG = {
+        "runways": [{"mode": "mixed"}],
+        "inbound_flow": 40, "outbound_flow": 30,
+        "sim_duration": 120, "seed": 42,
+    }
+
+    def _run_id(self) -> str:
+        resp = client.post("/simulate", json=self.CONFIG)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert "landed_aircraft" not in data
+        return data["run_id"]
+
+    def _all_logs(self, run_id: str, **params) -> list[dict]:
+        items, cursor = [], None
+        while True:
+            query = {**params, "limit": 7}
+            if cursor is not None:
+                query["cursor"] = cursor
+            page = client.get(f"/runs/{run_id}/logs", params=query).json()
+            items += page["items"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return items
+
+    def test_include_logs(self):
+        resp = client.post("/simulate", params={"include_logs": True}, json=self.CONFIG)
+        data = resp.json()
+        assert data["run_id"]
+        assert len(data["landed_aircraft"]) == data["total_arrivals"]
+
+    def test_summary_by_run_id(self):
+        run_id = self._run_id()
+        resp = client.get(f"/runs/{run_id}")
+        assert resp.status_code == 200
+        assert resp.json()["run_id"] == run_id
+
+    def test_unknown_run(self):
+        assert client.get("/runs/nope").status_code == 404
+        assert client.get("/runs/nope/logs").status_code == 404
+
+    def test_pagination_covers_every_log(self):
+        run_id = self._run_id()
+        full = client.post(
+            "/simulate", params={"include_logs": True}, json=self.CONFIG
+        ).json()
+        expected = sum(
+            len(full[k]) for k in
+            ("landed_aircraft", "departed_aircraft", "diverted_aircraft", "cancelled_aircraft")
+        )
+        items = self._all_logs(run_id)
+        assert len(items) == expected
+        times = [i["scheduled_time"] for i in items]
+        assert times == sorted(times)
+
+    def test_filters_and_sort(self):
+        run_id = self._run_id()
+        items = self._all_logs(
+            run_id, outcome=["landed", "departed"], min_delay=5,
+            from_time=10, to_time=90, sort="delay", order="desc",
+        )
+        assert items
+        assert all(i["outcome"] in ("landed", "departed") for i in items)
+        assert all(i["delay"] >= 5 and 10 <= i["entry_time"] <= 90 for i in items)
+        delays = [i["delay"] for i in items]
+        assert delays == sorted(delays, reverse=True)
+
+        page = client.get(
+            f"/runs/{run_id}/logs", params={"outcome": "landed", "limit": 1}
+        ).json()
+        assert page["total"] == client.get(f"/runs/{run_id}").json()["total_arrivals"]
+
+    def test_bad_cursor(self):
+        run_id = self._run_id()
+        resp = client.get(f"/runs/{run_id}/logs", params={"cursor": "x"})
+        assert resp.status_code == 400
+
+    def test_store_survives_concurrent_eviction(self):
+        results = AirportSimulation(SimConfig(**self.CONFIG)).run()
+        small = ResultStore(max_runs=2)
+        ids = [small.add(results).run_id for _ in range(3)]
+
+        def churn():
+            for _ in range(300):
+                ids.append(small.add(results).run_id)
+
+        def read():
+            for _ in range(3000):
+                small.get(ids[-1])
+                small.get(ids[-3])
+
+        # Switch threads as often as possible so a get() can interleave
+        # with an add() that evicts the run it is reading
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(4) as pool:
+                futures = [pool.submit(churn), *(pool.submit(read) for _ in range(3))]
+                for future in futures:
+                    future.result()
+        finally:
+            sys.setswitchinterval(interval)
+        assert len(small._runs) == 2
+
+
+def test_replicate_rejects_unknown_metric():
+    resp = client.post("/simulate/replicate", json={"targets": {"nope": 1.0}})
+    assert resp.status_code == 422
+
+
+class TestStreamSubscription:
+    @pytest.fixture(autouse=True)
+    def fast_ticks(self, monkeypatch):
+        monkeypatch.setattr(routes, "STREAM_TICK_DELAY", 0)
+
+    def test_stream_sends_only_subscribed_fields(self):
+        request = {
+            "runways": [{"mode": "mixed"}], "sim_duration": 12, "seed": 1,
+            "subscription": {
+                "metrics": ["total_arrivals", "max_holding_size"],
+                "series": ["holding_size_over_time"],
+                "resolution": 5,
+                "logs": False,
+            },
+        }
+        with client.websocket_connect("/simulate/stream") as ws:
+            ws.send_json(request)
+            messages = [ws.receive_json() for _ in range(13)]
+        ticks, done = messages[:-1], messages[-1]
+        assert set(ticks[-1]) == {
+            "type", "sim_time", "sim_duration",
+            "total_arrivals", "max_holding_size", "holding_size_over_time",
+        }
+        assert [t for t, _ in ticks[-1]["holding_size_over_time"]] == [0, 5, 10]
+        assert done["type"] == "done"
+        assert client.get(f"/runs/{done['run_id']}").status_code == 200
+
+    def test_stream_without_subscription_is_unchanged(self):
+        with client.websocket_connect("/simulate/stream") as ws:
+            ws.send_json({"runways": [{"mode": "mixed"}], "sim_duration": 2, "seed": 1})
+            tick = ws.receive_json()
+        assert "landed_aircraft" in tick and "avg_takeoff_wait" in tick
@@ -1,13 +1,26 @@
 import pytest
+import simpy
+
 from app.models import (
     EmergencyStatus,
+    OccupancyModel,
     RunwayConfig,
     RunwayClosure,
     RunwayMode,
     RunwayStatus,
     SimConfig,
+    StreamSubscription,
+    WakeCategory,
+)
+from app.simulation.engine import (
+    ARRIVAL,
+    DEPARTURE,
+    LANDING_DURATION,
+    RUNWAY_OCCUPANCY,
+    WAKE_SEPARATION,
+    AirportSimulation,
+    SimRunway,
 )
-from app.simulation.engine import AirportSimulation
 
 
 def _run(config: SimConfig):
@@ -184,6 +197,78 @@ class TestFuelDiversions:
         assert r.total_diversions == 0
 
 
+# -- Separation-based runway occupancy --
+
+
+HEAVY = list(WakeCategory).index(WakeCategory.HEAVY)
+LIGHT = list(WakeCategory).index(WakeCategory.LIGHT)
+
+
+class TestSeparationOccupancy:
+    def _runway(self, **kwargs) -> SimRunway:
+        return SimRunway(
+            simpy.Environment(), RunwayConfig(mode=RunwayMode.MIXED, **kwargs),
+            OccupancyModel.SEPARATION,
+        )
+
+    def test_constant_model_ignores_wake(self):
+        rw = SimRunway(simpy.Environment(), RunwayConfig())
+        assert rw.occupancy(ARRIVAL, HEAVY) == (0.0, 2.0)
+        assert rw.occupancy(DEPARTURE, LIGHT) == (0.0, 2.0)
+
+    def test_light_behind_heavy_waits_for_spacing(self):
+        rw = self._runway()
+        spacing, heavy_rot = rw.occupancy(ARRIVAL, HEAVY)
+        assert spacing == 0.0
+        rw.env.run(until=heavy_rot)
+        spacing, _ = rw.occupancy(ARRIVAL, LIGHT)
+        assert spacing > 0.0
+        # Heavy behind light needs no more than the light's own occupancy
+        rw.env.run(until=10.0)
+        assert rw.occupancy(ARRIVAL, HEAVY)[0] == 0.0
+
+    def test_short_runway_slows_landings(self):
+        _, normal = self._runway(length=3000).occupancy(ARRIVAL, HEAVY)
+        _, short = self._runway(length=2000).occupancy(ARRIVAL, HEAVY)
+        assert short > normal
+
+    @staticmethod
+    def _back_to_back_gaps(config: SimConfig) -> list[tuple[int, int, float]]:
+        """(leader wake, follower wake, exit gap) for consecutive landings
+        where the follower was already holding when the leader vacated."""
+        landed = sorted(_run(config).landed_aircraft, key=lambda a: a.exit_time)
+        wake = list(WakeCategory).index
+        return [
+            (wake(a.wake_category), wake(b.wake_category), b.exit_time - a.exit_time)
+            for a, b in zip(landed, landed[1:])
+            if b.entry_time <= a.exit_time
+        ]
+
+    def test_separation_run(self):
+        config = SimConfig(
+            runways=[RunwayConfig(mode=RunwayMode.LANDING)],
+            inbound_flow=40, outbound_flow=0,
+            sim_duration=120, seed=42,
+        )
+        constant = self._back_to_back_gaps(config)
+        assert len(constant) > 20
+        assert all(gap == pytest.approx(LANDING_DURATION) for _, _, gap in constant)
+
+        separated = self._back_to_back_gaps(
+            config.model_copy(update={"occupancy_model": OccupancyModel.SEPARATION})
+        )
+        assert len(separated) > 20
+        for leader, follower, gap in separated:
+            # The follower starts once both the leader has vacated and the
+            # wake spacing from the leader's start has passed
+            rot_leader, rot_follower = RUNWAY_OCCUPANCY[ARRIVAL][[leader, follower]]
+            spacing = WAKE_SEPARATION[leader][follower]
+            assert gap == pytest.approx(max(spacing, rot_leader) + rot_follower - rot_leader)
+        gaps = [gap for _, _, gap in separated]
+        assert len({round(gap, 6) for gap in gaps}) > 1
+        assert sum(gaps) / len(gaps) < LANDING_DURATION
+
+
 # -- Determinism --
 
 
@@ -205,6 +290,23 @@ class TestDeterminism:
         assert r1.total_cancellations == r2.total_cancellations
         assert r1.avg_holding_time == r2.avg_holding_time
 
+    def test_departures_do_not_perturb_arrivals(self):
+        """Arrivals draw from their own streams, so changing departure
+        traffic on a separate runway leaves every arrival unchanged."""
+        base = SimConfig(
+            runways=[
+                RunwayConfig(mode=RunwayMode.LANDING),
+                RunwayConfig(mode=RunwayMode.TAKEOFF),
+            ],
+            inbound_flow=20, outbound_flow=10,
+            sim_duration=120, seed=9,
+        )
+        busier = base.model_copy(update={"outbound_flow": 25})
+        r1, r2 = _run(base), _run(busier)
+        assert r1.total_departures != r2.total_departures
+        assert r1.landed_aircraft == r2.landed_aircraft
+        assert r1.diverted_aircraft == r2.diverted_aircraft
+
 
 # -- Edge cases --
 
@@ -229,3 +331,72 @@ class TestEdgeCases:
         r = _run(config)
         assert len(r.holding_size_over_time) > 0
         assert len(r.takeoff_queue_over_time) > 0
+
+
+class TestCompile:
+    def test_earlier_results_unaffected_by_later_steps(self):
+        config = SimConfig(
+            runways=[RunwayConfig(mode=RunwayMode.MIXED)],
+            inbound_flow=15, outbound_flow=15,
+            sim_duration=60, seed=5,
+        )
+        sim = AirportSimulation(config)
+        sim.setup()
+        sim.step(30)
+        early = sim.stats.compile()
+        landed = len(early.landed_aircraft)
+        sim.step(60)
+        late = sim.stats.compile()
+        assert len(early.landed_aircraft) == landed
+        assert len(late.landed_aircraft) == late.total_arrivals > landed
+        assert late.landed_aircraft[:landed] == early.landed_aircraft
+
+    def test_logs_are_api_models(self):
+        config = SimConfig(
+            runways=[RunwayConfig(mode=RunwayMode.LANDING)],
+            inbound_flow=60, outbound_flow=0,
+            sim_duration=60, seed=42,
+        )
+        r = _run(config)
+        log = r.diverted_aircraft[0]
+        assert log.outcome == "diverted"
+        assert log.direction == "inbound"
+        assert log.origin == "ORIG"
+        assert isinstance(log.emergency, EmergencyStatus)
+        dumped = r.model_dump(mode="json")["diverted_aircraft"][0]
+        assert type(dumped["emergency"]) is str
+        assert dumped["emergency"] == log.emergency.value
+        assert type(dumped["wake_category"]) is str
+        assert dumped["wake_category"] == log.wake_category.value
+
+
+class TestSubscribedSnapshots:
+    CONFIG = SimConfig(
+        runways=[RunwayConfig(mode=RunwayMode.MIXED)],
+        inbound_flow=20, outbound_flow=20,
+        sim_duration=60, seed=3,
+    )
+
+    def _sim(self) -> AirportSimulation:
+        sim = AirportSimulation(self.CONFIG)
+        sim.setup()
+        sim.step(self.CONFIG.sim_duration)
+        return sim
+
+    def test_default_subscription_is_full_results(self):
+        sim = self._sim()
+        full = sim.stats.compile().model_dump()
+        del full["run_id"]
+        assert sim.stats.compile_subscribed(StreamSubscription()) == full
+
+    def test_only_subscribed_parts(self):
+        sim = self._sim()
+        data = sim.stats.compile_subscribed(StreamSubscription(
+            metrics=["total_arrivals"], series=["holding_size_over_time"],
+            resolution=5, logs=False,
+        ))
+        assert set(data) == {"total_arrivals", "holding_size_over_time"}
+        raw = sim.stats.compile().holding_size_over_time
+        buckets = data["holding_size_over_time"]
+        assert [t for t, _ in buckets] == [float(t) for t in range(0, 60, 5)]
+        assert buckets[0][1] == max(size for t, size in raw if t < 5)
@@ -0,0 +1,127 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.models import (
+    EmergencyStatus,
+    ImportanceBias,
+    RareEventRequest,
+    RunwayConfig,
+    RunwayMode,
+    SimConfig,
+)
+from app.simulation import engine
+from app.simulation.engine import AirportSimulation
+from app.simulation.rare_events import estimate_rare_events
+
+CONFIG = SimConfig(
+    runways=[RunwayConfig(mode=RunwayMode.LANDING)],
+    inbound_flow=20, outbound_flow=0,
+    sim_duration=60, seed=3,
+)
+PLAIN = ImportanceBias(emergency_scale=1.0)
+EMERGENCY_TOTAL = (
+    engine.EMERGENCY_MECHANICAL_PROB
+    + engine.EMERGENCY_PASSENGER_PROB
+    + engine.EMERGENCY_FUEL_PROB
+)
+
+
+def test_emergency_weights_average_to_one():
+    scale = 8.0
+    probs = {
+        EmergencyStatus.MECHANICAL: engine.EMERGENCY_MECHANICAL_PROB,
+        EmergencyStatus.PASSENGER_HEALTH: engine.EMERGENCY_PASSENGER_PROB,
+        EmergencyStatus.FUEL: engine.EMERGENCY_FUEL_PROB,
+    }
+    probs[EmergencyStatus.NONE] = 1 - sum(probs.values())
+    biased = {e: scale * p for e, p in probs.items() if e != EmergencyStatus.NONE}
+    biased[EmergencyStatus.NONE] = 1 - sum(biased.values())
+    expected = sum(
+        biased[e] * math.exp(engine._emergency_log_ratio(e, scale)) for e in probs
+    )
+    assert expected == pytest.approx(1.0)
+
+
+def test_tilted_fuel_weights_average_to_one():
+    sim = AirportSimulation(CONFIG.model_copy(update={"seed": 0}))
+    weights, fuels = [], []
+    for _ in range(20000):
+        fuel, log_ratio = sim._tilted_fuel(0.1)
+        fuels.append(fuel)
+        weights.append(math.exp(log_ratio))
+    assert min(fuels) >= engine.FUEL_MIN and max(fuels) <= engine.FUEL_MAX
+    assert np.mean(fuels) < (engine.FUEL_MIN + engine.FUEL_MAX) / 2
+    assert np.mean(weights) == pytest.approx(1.0, abs=0.03)
+
+
+def test_unbiased_sampling_has_unit_weights():
+    request = RareEventRequest(config=CONFIG, bias=PLAIN, replications=20)
+    r = estimate_rare_events(request, max_workers=1)
+    assert r.effective_sample_size == pytest.approx(r.aircraft)
+
+
+def test_partial_bias_keeps_the_default_scale():
+    request = RareEventRequest.model_validate({"bias": {"fuel_tilt": 0.05}})
+    assert request.bias.emergency_scale == RareEventRequest().bias.emergency_scale > 1.0
+
+
+def _agree(a, b) -> bool:
+    return abs(a.estimate - b.estimate) < 4 * math.hypot(a.std_error, b.std_error)
+
+
+def test_default_bias_agrees_with_plain_sampling():
+    plain = estimate_rare_events(
+        RareEventRequest(config=CONFIG, bias=PLAIN, replications=2000),
+        max_workers=1,
+    )
+    biased = estimate_rare_events(
+        RareEventRequest(config=CONFIG, replications=600), max_workers=1
+    )
+    assert biased.effective_sample_size > 0.5 * biased.aircraft
+
+    diversions = biased.estimates["diversion_probability"]
+    assert diversions.estimate > 0
+    assert _agree(diversions, plain.estimates["diversion_probability"])
+    assert _agree(biased.estimates["expected_diversions"], plain.estimates["expected_diversions"])
+    # Per replication, the biased emergency estimate is less noisy
+    emergencies = biased.estimates["emergency_probability"]
+    plain_emergencies = plain.estimates["emergency_probability"]
+    assert emergencies.variance * 600 < plain_emergencies.variance * 2000
+
+
+def test_emergency_probability_is_exact_on_mixed_runway():
+    # Departures share the runway, so state carries between holding busy
+    # periods; weights must cover every draw before each outcome
+    config = SimConfig(
+        runways=[RunwayConfig(mode=RunwayMode.MIXED)],
+        inbound_flow=18, outbound_flow=12, seed=11,
+    )
+    r = estimate_rare_events(RareEventRequest(config=config, replications=1500), max_workers=1)
+    assert r.effective_sample_size > 0.5 * r.aircraft
+    emergencies = r.estimates["emergency_probability"]
+    assert abs(emergencies.estimate - EMERGENCY_TOTAL) < 3 * emergencies.std_error
+
+
+def test_warns_when_bias_collapses_weights():
+    request = RareEventRequest(
+        config=CONFIG.model_copy(update={"inbound_flow": 28}),
+        bias=ImportanceBias(emergency_scale=30.0, fuel_tilt=0.3),
+        replications=50,
+    )
+    r = estimate_rare_events(request, max_workers=1)
+    assert r.effective_sample_size < 0.1 * r.aircraft
+    assert any("effective sample size" in w for w in r.warnings)
+
+
+def test_warns_on_too_few_hits():
+    config = CONFIG.model_copy(update={"inbound_flow": 2, "sim_duration": 30})
+    r = estimate_rare_events(RareEventRequest(config=config, replications=5), max_workers=1)
+    assert r.estimates["diversion_probability"].estimate == 0.0
+    assert any("only 0 aircraft with diversion" in w for w in r.warnings)
+
+    # A handful of hits is not enough either
+    r = estimate_rare_events(RareEventRequest(config=CONFIG, replications=100), max_workers=1)
+    assert 0 < r.estimates["diversion_probability"].estimate
+    assert any("aircraft with diversion sampled" in w for w in r.warnings)
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.models import ReplicationRequest, RunwayConfig, RunwayMode, SimConfig
+from app.simulation.replication import (
+    RunningStats,
+    replication_configs,
+    replication_pool,
+    run_replications,
+    shared_pool,
+    shutdown_pool,
+)
+
+CONFIG = SimConfig(
+    runways=[
+        RunwayConfig(mode=RunwayMode.LANDING),
+        RunwayConfig(mode=RunwayMode.TAKEOFF),
+    ],
+    inbound_flow=15, outbound_flow=15,
+    sim_duration=60, seed=42,
+)
+
+
+def test_running_stats_matches_numpy():
+    values = np.random.default_rng(0).normal(5, 2, size=50)
+    running = RunningStats()
+    for v in values:
+        running.push(float(v))
+    assert running.mean == pytest.approx(values.mean())
+    assert running.variance == pytest.approx(values.var(ddof=1))
+
+
+def test_stops_once_target_met():
+    request = ReplicationRequest(
+        config=CONFIG, targets={"avg_arrival_delay": 5.0},
+        batch_size=4, min_replications=4, max_replications=200,
+    )
+    r = run_replications(request, max_workers=1)
+    assert r.converged
+    assert r.replications < 200
+    est = r.metrics["avg_arrival_delay"]
+    assert est.half_width <= 5.0
+
+
+def test_budget_exhausted():
+    request = ReplicationRequest(
+        config=CONFIG, targets={"avg_arrival_delay": 1e-6, "total_arrivals": 1e-6},
+        batch_size=3, min_replications=2, max_replications=7,
+    )
+    r = run_replications(request, max_workers=1)
+    assert not r.converged
+    assert r.replications == 7
+
+
+def test_batching_does_not_change_estimates():
+    def estimate(batch_size: int, workers: int) -> float:
+        request = ReplicationRequest(
+            config=CONFIG, targets={"avg_holding_time": 1e-6},
+            batch_size=batch_size, min_replications=2, max_replications=6,
+        )
+        return run_replications(request, max_workers=workers).metrics["avg_holding_time"].mean
+
+    assert estimate(2, 1) == pytest.approx(estimate(6, 2))
+
+
+def test_requests_share_one_pool():
+    request = ReplicationRequest(
+        config=CONFIG, targets={"avg_holding_time": 1e-6},
+        batch_size=2, min_replications=2, max_replications=2,
+    )
+    try:
+        with replication_pool() as first, replication_pool() as second:
+            assert first.__self__ is second.__self__ is shared_pool()
+        assert run_replications(request).replications == 2
+        assert shared_pool() is first.__self__
+    finally:
+        shutdown_pool()
+    assert shared_pool() is not first.__self__
+    shutdown_pool()
+
+
+def test_rejects_unknown_metric():
+    with pytest.raises(ValidationError):
+        ReplicationRequest(targets={"landed_aircraft": 1.0})
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"min_replications": 50, "max_replications": 10},
+        {"max_replications": 100_000},
+        {"batch_size": 10_000},
+    ],
+)
+def test_rejects_bad_budget(fields):
+    with pytest.raises(ValidationError):
+        ReplicationRequest(**fields)
+
+
+def test_replication_seeds_keep_full_entropy():
+    configs = replication_configs(CONFIG, np.random.SeedSequence(42), 100)
+    seeds = [c.seed for c in configs]
+    assert len(set(seeds)) == 100
+    assert max(seeds) >= 2**64
@@ -0,0 +1,62 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.models import RunwayClosure, RunwayConfig, RunwayMode, SimConfig
+from app.simulation.surrogate import Surrogate, train
+
+RUNWAYS = [RunwayConfig(mode=RunwayMode.LANDING), RunwayConfig(mode=RunwayMode.TAKEOFF)]
+
+
+@pytest.fixture(scope="module")
+def surrogate() -> Surrogate:
+    return train(
+        inbound=[0, 10, 20], outbound=[0, 10], max_wait=[20, 30],
+        layouts=[(1, 1, 0)], sim_duration=30, replications=2, max_workers=1,
+    )
+
+
+def _config(**kwargs) -> SimConfig:
+    return SimConfig(runways=RUNWAYS, **{
+        "inbound_flow": 10, "outbound_flow": 10, "max_wait_time": 30,
+        "sim_duration": 30, **kwargs,
+    })
+
+
+def test_interpolates_between_nodes(surrogate):
+    low = surrogate.predict(_config(inbound_flow=10)).metrics["total_arrivals"]
+    high = surrogate.predict(_config(inbound_flow=20)).metrics["total_arrivals"]
+    mid = surrogate.predict(_config(inbound_flow=15))
+    assert mid.source == "surrogate"
+    assert mid.metrics["total_arrivals"] == pytest.approx((low + high) / 2)
+    assert all(e >= 0 for e in mid.errors.values())
+
+
+def test_outside_trained_region(surrogate):
+    assert surrogate.predict(_config(inbound_flow=25)) is None
+    assert surrogate.predict(_config(sim_duration=60)) is None
+    assert surrogate.predict(_config(closures=[
+        RunwayClosure(runway_index=0, start_time=0, end_time=10)
+    ])) is None
+    mixed = _config().model_copy(update={"runways": [RunwayConfig(mode=RunwayMode.MIXED)]})
+    assert surrogate.predict(mixed) is None
+
+
+def test_save_and_load(surrogate, tmp_path):
+    path = tmp_path / "surrogate.npz"
+    surrogate.save(path)
+    loaded = Surrogate.load(path)
+    config = _config(inbound_flow=12.5, max_wait_time=25)
+    assert loaded.predict(config) == surrogate.predict(config)
+    assert Surrogate.load(tmp_path / "missing.npz") is None
+
+
+def test_predict_endpoint(surrogate, monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setattr(routes, "surrogate", surrogate)
+    inside = client.post("/predict", json=_config().model_dump(mode="json"))
+    assert inside.json()["source"] == "surrogate"
+    outside = client.post("/predict", json=_config(inbound_flow=40).model_dump(mode="json"))
+    assert outside.json()["source"] == "simulation"
+    assert outside.json()["errors"] == {}
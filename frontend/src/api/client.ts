@@ -1,10 +1,18 @@
-import type { SimConfig, SimResults } from "@/types";
+import type {
+  LogPage,
+  LogQuery,
+  Prediction,
+  SimConfig,
+  SimResults,
+  SimSummary,
+  StreamSubscription,
+} from "@/types";
 
 const API_BASE = "http://localhost:8000";
 const WS_BASE = "ws://localhost:8000";
 
 export async function runSimulation(config: SimConfig): Promise<SimResults> {
-  const resp = await fetch(`${API_BASE}/simulate`, {
+  const resp = await fetch(`${API_BASE}/simulate?include_logs=true`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
     body: JSON.stringify(config),
@@ -16,6 +24,35 @@ export async function runSimulation(config: SimConfig): Promise<SimResults> {
   return resp.json();
 }
 
+export async function predict(config: SimConfig): Promise<Prediction> {
+  const resp = await fetch(`${API_BASE}/predict`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(config),
+  });
+  if (!resp.ok) {
+    const text = await resp.text();
+    throw new Error(`Prediction failed (${resp.status}): ${text}`);
+  }
+  return resp.json();
+}
+
+export async function fetchRunLogs(runId: string, query: LogQuery = {}): Promise<LogPage> {
+  const params = new URLSearchParams();
+  for (const [key, value] of Object.entries(query)) {
+    if (value === undefined || value === null) continue;
+    for (const v of Array.isArray(value) ? value : [value]) {
+      params.append(key, String(v));
+    }
+  }
+  const resp = await fetch(`${API_BASE}/runs/${runId}/logs?${params}`);
+  if (!resp.ok) {
+    const text = await resp.text();
+    throw new Error(`Fetching logs failed (${resp.status}): ${text}`);
+  }
+  return resp.json();
+}
+
 export async function healthCheck(): Promise<boolean> {
   try {
     const resp = await fetch(`${API_BASE}/health`);
@@ -25,7 +62,7 @@ export async function healthCheck(): Promise<boolean> {
   }
 }
 
-export type StreamTickData = SimResults & {
+export type StreamTickData = SimSummary & {
   type: "tick" | "done";
   sim_time: number;
   sim_duration: number;
@@ -36,11 +73,12 @@ export function streamSimulation(
   onTick: (data: StreamTickData) => void,
   onDone: (data: StreamTickData) => void,
   onError: (err: string) => void,
+  subscription?: StreamSubscription,
 ): () => void {
   const ws = new WebSocket(`${WS_BASE}/simulate/stream`);
 
   ws.onopen = () => {
-    ws.send(JSON.stringify(config));
+    ws.send(JSON.stringify(subscription ? { ...config, subscription } : config));
   };
 
   ws.onmessage = (event) => {
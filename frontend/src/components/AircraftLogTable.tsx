@@ -0,0 +1,135 @@
+import { useCallback, useEffect, useRef, useState, type UIEvent } from "react";
+import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
+import { Badge } from "@/components/ui/badge";
+import {
+  Table,
+  TableBody,
+  TableCell,
+  TableHead,
+  TableHeader,
+  TableRow,
+} from "@/components/ui/table";
+import { fetchRunLogs } from "@/api/client";
+import type { AircraftLog } from "@/types";
+
+const PAGE_SIZE = 50;
+// Fetch the next page once the user scrolls within this many pixels of the end
+const SCROLL_THRESHOLD = 48;
+
+interface Props {
+  runId: string | null;
+}
+
+/** Aircraft log of a stored run, fetched a page at a time as the table scrolls. */
+export function AircraftLogTable({ runId }: Props) {
+  const [rows, setRows] = useState<AircraftLog[]>([]);
+  const [total, setTotal] = useState<number | null>(null);
+  const [cursor, setCursor] = useState<string | null>(null);
+  const [error, setError] = useState<string | null>(null);
+  const fetching = useRef(false);
+  const currentRun = useRef(runId);
+
+  const loadPage = useCallback(
+    async (id: string, after: string | null) => {
+      fetching.current = true;
+      try {
+        const page = await fetchRunLogs(id, { sort: "entry_time", cursor: after, limit: PAGE_SIZE });
+        if (currentRun.current !== id) return; // a newer run replaced this one
+        setRows((prev) => (after ? [...prev, ...page.items] : page.items));
+        setTotal(page.total);
+        setCursor(page.next_cursor);
+        setError(null);
+      } catch (err) {
+        setError(err instanceof Error ? err.message : String(err));
+      } finally {
+        fetching.current = false;
+      }
+    },
+    [],
+  );
+
+  useEffect(() => {
+    currentRun.current = runId;
+    setRows([]);
+    setTotal(null);
+    setCursor(null);
+    if (runId) loadPage(runId, null);
+  }, [runId, loadPage]);
+
+  const handleScroll = (e: UIEvent<HTMLDivElement>) => {
+    const el = e.currentTarget;
+    if (!runId || !cursor || fetching.current) return;
+    if (el.scrollHeight - el.scrollTop - el.clientHeight < SCROLL_THRESHOLD) {
+      loadPage(runId, cursor);
+    }
+  };
+
+  return (
+    <Card>
+      <CardHeader className="px-3 py-1.5">
+        <CardTitle className="text-[10px] font-semibold uppercase tracking-wider text-muted-foreground">
+          Aircraft Log {total !== null && `(${total})`}
+        </CardTitle>
+      </CardHeader>
+      <CardContent className="px-3 pb-2 pt-0">
+        {!runId ? (
+          <p className="text-[11px] text-muted-foreground">Available when the run finishes.</p>
+        ) : error ? (
+          <p className="text-[11px] text-destructive">{error}</p>
+        ) : (
+          <div className="max-h-48 overflow-y-auto rounded-md border" onScroll={handleScroll}>
+            <Table>
+              <TableHeader>
+                <TableRow>
+                  <TableHead className="h-6 text-[10px] px-2">Callsign</TableHead>
+                  <TableHead className="h-6 text-[10px] px-2">Dir</TableHead>
+                  <TableHead className="h-6 text-[10px] px-2">Emerg.</TableHead>
+                  <TableHead className="h-6 text-[10px] px-2">Outcome</TableHead>
+                  <TableHead className="h-6 text-[10px] px-2 text-right">Wait</TableHead>
+                  <TableHead className="h-6 text-[10px] px-2 text-right">Delay</TableHead>
+                  <TableHead className="h-6 text-[10px] px-2 text-right">Fuel</TableHead>
+                </TableRow>
+              </TableHeader>
+              <TableBody>
+                {rows.map((a, i) => (
+                  <TableRow key={i} className={a.emergency !== "none" ? "bg-purple-50/50" : ""}>
+                    <TableCell className="py-1 px-2 font-mono text-[11px]">{a.callsign}</TableCell>
+                    <TableCell className="py-1 px-2 text-[11px]">{a.direction === "inbound" ? "In" : "Out"}</TableCell>
+                    <TableCell className="py-1 px-2"><EmergencyBadge status={a.emergency} /></TableCell>
+                    <TableCell className="py-1 px-2"><OutcomeBadge outcome={a.outcome} /></TableCell>
+                    <TableCell className="py-1 px-2 text-[11px] text-right font-mono">{a.wait_time.toFixed(1)}</TableCell>
+                    <TableCell className="py-1 px-2 text-[11px] text-right font-mono">{a.delay.toFixed(1)}</TableCell>
+                    <TableCell className="py-1 px-2 text-[11px] text-right font-mono">{a.fuel_at_entry.toFixed(0)}m</TableCell>
+                  </TableRow>
+                ))}
+              </TableBody>
+            </Table>
+          </div>
+        )}
+      </CardContent>
+    </Card>
+  );
+}
+
+/* ── Sub-components ── */
+
+function EmergencyBadge({ status }: { status: string }) {
+  if (status === "none") return <span className="text-muted-foreground/30 text-[10px]">-</span>;
+  const config: Record<string, { label: string; variant: "destructive" | "secondary" }> = {
+    fuel: { label: "Fuel", variant: "destructive" },
+    mechanical: { label: "Mech", variant: "destructive" },
+    passenger_health: { label: "Med", variant: "secondary" },
+  };
+  const c = config[status] ?? { label: status, variant: "secondary" as const };
+  return <Badge variant={c.variant} className="text-[9px] h-4 px-1 py-0">{c.label}</Badge>;
+}
+
+function OutcomeBadge({ outcome }: { outcome: string }) {
+  const variants: Record<string, "default" | "secondary" | "destructive" | "outline"> = {
+    landed: "default",
+    departed: "secondary",
+    diverted: "outline",
+    cancelled: "destructive",
+  };
+  return <Badge variant={variants[outcome] ?? "outline"} className="text-[9px] h-4 px-1 py-0 capitalize">{outcome}</Badge>;
+}
@@ -1,3 +1,4 @@
+import { useEffect, useState } from "react";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
@@ -10,7 +11,8 @@ import {
   SelectValue,
 } from "@/components/ui/select";
 import { RunwayEditor } from "./RunwayEditor";
-import type { SimConfig, RunwayConfig, RunwayClosure, RunwayStatus } from "@/types";
+import { predict } from "@/api/client";
+import type { Prediction, SimConfig, RunwayConfig, RunwayClosure, RunwayStatus } from "@/types";
 
 interface Props {
   config: SimConfig;
@@ -28,6 +30,16 @@ const CLOSURE_REASONS: { value: RunwayStatus; label: string }[] = [
   { value: "equipment_failure", label: "Equipment" },
 ];
 
+// Wait this long after the last edit before asking for an instant estimate
+const PREDICT_DEBOUNCE_MS = 400;
+
+const ESTIMATE_METRICS: { key: string; label: string; unit: string }[] = [
+  { key: "avg_holding_time", label: "Avg hold", unit: "m" },
+  { key: "avg_takeoff_wait", label: "Avg takeoff wait", unit: "m" },
+  { key: "total_diversions", label: "Diversions", unit: "" },
+  { key: "total_cancellations", label: "Cancellations", unit: "" },
+];
+
 export function ConfigPanel({ config, onChange, onRun, onStop, loading, simTime, simDuration }: Props) {
   const update = (fields: Partial<SimConfig>) =>
     onChange({ ...config, ...fields });
@@ -100,6 +112,8 @@ export function ConfigPanel({ config, onChange, onRun, onStop, loading, simTime,
         </Button>
       )}
 
+      {!loading && <EstimateCard config={config} />}
+
       {/* Simulation Parameters */}
       <Card>
         <CardHeader className="px-3 py-2">
@@ -201,6 +215,64 @@ export function ConfigPanel({ config, onChange, onRun, onStop, loading, simTime,
   );
 }
 
+/** Instant estimate from /predict, refreshed shortly after the config stops changing. */
+function EstimateCard({ config }: { config: SimConfig }) {
+  const [prediction, setPrediction] = useState<Prediction | null>(null);
+  const [error, setError] = useState<string | null>(null);
+
+  useEffect(() => {
+    let stale = false;
+    const timer = setTimeout(() => {
+      predict(config)
+        .then((p) => {
+          if (stale) return;
+          setPrediction(p);
+          setError(null);
+        })
+        .catch((err) => {
+          if (!stale) setError(err instanceof Error ? err.message : String(err));
+        });
+    }, PREDICT_DEBOUNCE_MS);
+    return () => {
+      stale = true;
+      clearTimeout(timer);
+    };
+  }, [config]);
+
+  return (
+    <Card>
+      <CardHeader className="px-3 py-2">
+        <CardTitle className="text-xs font-semibold uppercase tracking-wider text-muted-foreground">
+          Estimate {prediction && <span className="normal-case font-normal">({prediction.source})</span>}
+        </CardTitle>
+      </CardHeader>
+      <CardContent className="px-3 pb-3 pt-0">
+        {error ? (
+          <p className="text-[11px] text-destructive">{error}</p>
+        ) : !prediction ? (
+          <p className="text-[11px] text-muted-foreground italic">Estimating...</p>
+        ) : (
+          <div className="grid grid-cols-2 gap-x-3 gap-y-1">
+            {ESTIMATE_METRICS.map(({ key, label, unit }) => {
+              const value = prediction.metrics[key];
+              const err = prediction.errors[key];
+              return (
+                <div key={key} className="flex justify-between text-[11px]">
+                  <span className="text-muted-foreground">{label}</span>
+                  <span className="font-mono tabular-nums">
+                    {value === undefined ? "-" : `${value.toFixed(1)}${unit}`}
+                    {err !== undefined && <span className="text-muted-foreground"> ±{err.toFixed(1)}</span>}
+                  </span>
+                </div>
+              );
+            })}
+          </div>
+        )}
+      </CardContent>
+    </Card>
+  );
+}
+
 function FieldCompact({ label, value, onChange, min, max }: { label: string; value: number; onChange: (v: number) => void; min?: number; max?: number }) {
   return (
     <div className="space-y-1">
@@ -1,3 +1,4 @@
+import { useEffect, useState } from "react";
 import {
   LineChart,
   Line,
@@ -10,19 +11,14 @@ import {
 } from "recharts";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
-import { Badge } from "@/components/ui/badge";
-import {
-  Table,
-  TableBody,
-  TableCell,
-  TableHead,
-  TableHeader,
-  TableRow,
-} from "@/components/ui/table";
-import type { SimResults, AircraftLog } from "@/types";
+import { AircraftLogTable } from "@/components/AircraftLogTable";
+import { fetchRunLogs } from "@/api/client";
+import type { SimSummary } from "@/types";
+
+const EMERGENCIES = ["fuel", "mechanical", "passenger_health"] as const;
 
 interface Props {
-  results: SimResults;
+  results: SimSummary;
   onSave: (name: string) => void;
   simDuration: number;
   loading: boolean;
@@ -31,13 +27,19 @@ interface Props {
 export function ResultsDashboard({ results, onSave, simDuration, loading }: Props) {
   const r = results;
 
-  const allAircraft: AircraftLog[] = [
-    ...r.landed_aircraft,
-    ...r.departed_aircraft,
-    ...r.diverted_aircraft,
-    ...r.cancelled_aircraft,
-  ];
-  const emergencyCount = allAircraft.filter((a) => a.emergency !== "none").length;
+  // Counted server-side once the run is stored, rather than from downloaded logs
+  const [emergencyCount, setEmergencyCount] = useState<number | null>(null);
+  useEffect(() => {
+    setEmergencyCount(null);
+    if (!r.run_id) return;
+    let stale = false;
+    fetchRunLogs(r.run_id, { emergency: [...EMERGENCIES], limit: 1 })
+      .then((page) => !stale && setEmergencyCount(page.total))
+      .catch(() => {});
+    return () => {
+      stale = true;
+    };
+  }, [r.run_id]);
 
   const chartData = r.holding_size_over_time.map(([time, holding], i) => ({
     time: Math.round(time),
@@ -64,7 +66,7 @@ export function ResultsDashboard({ results, onSave, simDuration, loading }: Prop
       <div className="grid grid-cols-5 gap-2">
         <SummaryCard label="Landed" value={r.total_arrivals} variant="success" />
         <SummaryCard label="Departed" value={r.total_departures} variant="info" />
-        <SummaryCard label="Emergency" value={emergencyCount} variant="emergency" />
+        <SummaryCard label="Emergency" value={emergencyCount ?? "-"} variant="emergency" />
         <SummaryCard label="Diverted" value={r.total_diversions} variant="warning" />
         <SummaryCard label="Cancelled" value={r.total_cancellations} variant="danger" />
       </div>
@@ -131,45 +133,7 @@ export function ResultsDashboard({ results, onSave, simDuration, loading }: Prop
       </Card>
 
       {/* Aircraft logs */}
-      <Card>
-        <CardHeader className="px-3 py-1.5">
-          <CardTitle className="text-[10px] font-semibold uppercase tracking-wider text-muted-foreground">
-            Aircraft Log ({allAircraft.length})
-          </CardTitle>
-        </CardHeader>
-        <CardContent className="px-3 pb-2 pt-0">
-          <div className="max-h-48 overflow-y-auto rounded-md border">
-            <Table>
-              <TableHeader>
-                <TableRow>
-                  <TableHead className="h-6 text-[10px] px-2">Callsign</TableHead>
-                  <TableHead className="h-6 text-[10px] px-2">Dir</TableHead>
-                  <TableHead className="h-6 text-[10px] px-2">Emerg.</TableHead>
-                  <TableHead className="h-6 text-[10px] px-2">Outcome</TableHead>
-                  <TableHead className="h-6 text-[10px] px-2 text-right">Wait</TableHead>
-                  <TableHead className="h-6 text-[10px] px-2 text-right">Delay</TableHead>
-                  <TableHead className="h-6 text-[10px] px-2 text-right">Fuel</TableHead>
-                </TableRow>
-              </TableHeader>
-              <TableBody>
-                {allAircraft
-                  .sort((a, b) => a.entry_time - b.entry_time)
-                  .map((a, i) => (
-                    <TableRow key={i} className={a.emergency !== "none" ? "bg-purple-50/50" : ""}>
-                      <TableCell className="py-1 px-2 font-mono text-[11px]">{a.callsign}</TableCell>
-                      <TableCell className="py-1 px-2 text-[11px]">{a.direction === "inbound" ? "In" : "Out"}</TableCell>
-                      <TableCell className="py-1 px-2"><EmergencyBadge status={a.emergency} /></TableCell>
-                      <TableCell className="py-1 px-2"><OutcomeBadge outcome={a.outcome} /></TableCell>
-                      <TableCell className="py-1 px-2 text-[11px] text-right font-mono">{a.wait_time.toFixed(1)}</TableCell>
-                      <TableCell className="py-1 px-2 text-[11px] text-right font-mono">{a.delay.toFixed(1)}</TableCell>
-                      <TableCell className="py-1 px-2 text-[11px] text-right font-mono">{a.fuel_at_entry.toFixed(0)}m</TableCell>
-                    </TableRow>
-                  ))}
-              </TableBody>
-            </Table>
-          </div>
-        </CardContent>
-      </Card>
+      <AircraftLogTable runId={r.run_id} />
     </div>
   );
 }
@@ -184,7 +148,7 @@ const variantStyles = {
   emergency: "border-purple-200 bg-purple-50 text-purple-700",
 };
 
-function SummaryCard({ label, value, variant }: { label: string; value: number; variant: keyof typeof variantStyles }) {
+function SummaryCard({ label, value, variant }: { label: string; value: number | string; variant: keyof typeof variantStyles }) {
   return (
     <div className={`rounded-lg border p-2 text-center ${variantStyles[variant]}`}>
       <div className="text-lg font-bold tabular-nums leading-tight">{value}</div>
@@ -201,24 +165,3 @@ function MetricLine({ label, value }: { label: string; value: string | number })
     </div>
   );
 }
-
-function EmergencyBadge({ status }: { status: string }) {
-  if (status === "none") return <span className="text-muted-foreground/30 text-[10px]">-</span>;
-  const config: Record<string, { label: string; variant: "destructive" | "secondary" }> = {
-    fuel: { label: "Fuel", variant: "destructive" },
-    mechanical: { label: "Mech", variant: "destructive" },
-    passenger_health: { label: "Med", variant: "secondary" },
-  };
-  const c = config[status] ?? { label: status, variant: "secondary" as const };
-  return <Badge variant={c.variant} className="text-[9px] h-4 px-1 py-0">{c.label}</Badge>;
-}
-
-function OutcomeBadge({ outcome }: { outcome: string }) {
-  const variants: Record<string, "default" | "secondary" | "destructive" | "outline"> = {
-    landed: "default",
-    departed: "secondary",
-    diverted: "outline",
-    cancelled: "destructive",
-  };
-  return <Badge variant={variants[outcome] ?? "outline"} className="text-[9px] h-4 px-1 py-0 capitalize">{outcome}</Badge>;
-}
@@ -69,7 +69,7 @@ export function RunwayEditor({ runway, index, onChange, onRemove }: Props) {
         </div>
         <div className="space-y-0.5">
           <Label className="text-[10px] text-muted-foreground">Length</Label>
-          <Input type="number" value={runway.length} onChange={(e) => update({ length: Number(e.target.value) })} className="h-7 text-xs" />
+          <Input type="number" min={1} value={runway.length} onChange={(e) => update({ length: Number(e.target.value) })} className="h-7 text-xs" />
         </div>
         <div className="space-y-0.5">
           <Label className="text-[10px] text-muted-foreground">Bearing</Label>
@@ -1,5 +1,5 @@
 import { useState, useCallback, useRef } from "react";
-import type { SimConfig, SimResults, SavedScenario, RunwayConfig } from "@/types";
+import type { SimConfig, SimSummary, SavedScenario, RunwayConfig, StreamSubscription } from "@/types";
 import { streamSimulation, type StreamTickData } from "@/api/client";
 
 const defaultRunway: RunwayConfig = {
@@ -10,6 +10,9 @@ const defaultRunway: RunwayConfig = {
   status: "available",
 };
 
+// Logs are left out of the stream; the log table pages them from /runs/{run_id}/logs
+const streamSubscription: StreamSubscription = { logs: false };
+
 const defaultConfig: SimConfig = {
   runways: [
     { ...defaultRunway, number: "09", mode: "landing" },
@@ -20,12 +23,13 @@ const defaultConfig: SimConfig = {
   max_wait_time: 30,
   sim_duration: 120,
   closures: [],
+  occupancy_model: "constant",
   seed: null,
 };
 
 export function useSimulation() {
   const [config, setConfig] = useState<SimConfig>(defaultConfig);
-  const [results, setResults] = useState<SimResults | null>(null);
+  const [results, setResults] = useState<SimSummary | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [scenarios, setScenarios] = useState<SavedScenario[]>([]);
@@ -48,9 +52,9 @@ export function useSimulation() {
 
     const applyTick = (data: StreamTickData) => {
       setSimTime(data.sim_time);
-      // Build a SimResults from the tick data (strip type/sim_time/sim_duration)
+      // Build a SimSummary from the tick data (strip type/sim_time/sim_duration)
       const { type: _t, sim_time: _st, sim_duration: _sd, ...rest } = data;
-      setResults(rest as SimResults);
+      setResults({ run_id: null, ...rest });
     };
 
     const cancel = streamSimulation(
@@ -66,6 +70,7 @@ export function useSimulation() {
         setLoading(false);
         cancelRef.current = null;
       },
+      streamSubscription,
     );
     cancelRef.current = cancel;
   }, [config]);
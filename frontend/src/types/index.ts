@@ -1,6 +1,8 @@
 export type RunwayMode = "landing" | "takeoff" | "mixed";
 export type RunwayStatus = "available" | "inspection" | "snow" | "equipment_failure";
 export type EmergencyStatus = "none" | "fuel" | "mechanical" | "passenger_health";
+export type WakeCategory = "light" | "medium" | "heavy";
+export type OccupancyModel = "constant" | "separation";
 
 export interface RunwayConfig {
   number: string;
@@ -24,6 +26,7 @@ export interface SimConfig {
   max_wait_time: number;
   sim_duration: number;
   closures: RunwayClosure[];
+  occupancy_model: OccupancyModel;
   seed: number | null;
 }
 
@@ -39,11 +42,13 @@ export interface AircraftLog {
   wait_time: number;
   delay: number;
   emergency: EmergencyStatus;
+  wake_category: WakeCategory;
   fuel_at_entry: number;
   outcome: "landed" | "departed" | "diverted" | "cancelled";
 }
 
-export interface SimResults {
+export interface SimSummary {
+  run_id: string | null;
   total_departures: number;
   total_cancellations: number;
   max_takeoff_queue_size: number;
@@ -58,15 +63,51 @@ export interface SimResults {
   avg_arrival_delay: number;
   takeoff_queue_over_time: [number, number][];
   holding_size_over_time: [number, number][];
+}
+
+export interface SimResults extends SimSummary {
   landed_aircraft: AircraftLog[];
   departed_aircraft: AircraftLog[];
   diverted_aircraft: AircraftLog[];
   cancelled_aircraft: AircraftLog[];
 }
 
+export type LogSortField = "scheduled_time" | "entry_time" | "exit_time" | "wait_time" | "delay";
+
+export interface LogQuery {
+  outcome?: AircraftLog["outcome"][];
+  emergency?: EmergencyStatus[];
+  from_time?: number;
+  to_time?: number;
+  min_delay?: number;
+  sort?: LogSortField;
+  order?: "asc" | "desc";
+  cursor?: string | null;
+  limit?: number;
+}
+
+export interface LogPage {
+  items: AircraftLog[];
+  total: number;
+  next_cursor: string | null;
+}
+
+export interface StreamSubscription {
+  metrics?: string[] | null;
+  series?: ("takeoff_queue_over_time" | "holding_size_over_time")[] | null;
+  resolution?: number | null;
+  logs?: boolean;
+}
+
+export interface Prediction {
+  source: "surrogate" | "simulation";
+  metrics: Record<string, number>;
+  errors: Record<string, number>;
+}
+
 export interface SavedScenario {
   id: string;
   name: string;
   config: SimConfig;
-  results: SimResults;
+  results: SimSummary;
 }